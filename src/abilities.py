@@ -0,0 +1,384 @@
+from typing import NamedTuple
+
+from enums import AbilityLevel, BaseValue, Modifier, Specialization
+
+
+class Stat(NamedTuple):
+    # One summary line. The template's "{}" is filled with the value,
+    # which is computed as
+    #   (base + additions + spec_add) * (1 + bonuses + spec_bonus) * (1 - haste - spec_haste)
+    # where a factor is only applied if the stat has something that feeds it.
+    template: str
+    # Values at ability levels 1, 2 and 3, or the base value talents provide
+    base: tuple[float, float, float] | BaseValue
+    additions: tuple[Modifier, ...] = ()
+    bonuses: tuple[Modifier, ...] = ()
+    haste: tuple[Modifier, ...] = ()
+    spec_add: float = 0
+    spec_bonus: float = 0
+    spec_haste: float = 0
+    # Shown as a percentage, e.g. 0.8 -> "80"
+    percent: bool = False
+    # Shown without rounding
+    exact: bool = False
+    # Left out of the summary when 0
+    optional: bool = False
+    # Rounded before being scaled to a percentage
+    rounded: bool = False
+
+
+class Ability(NamedTuple):
+    title: str
+    # None for abilities every Shepard has
+    level: AbilityLevel | None
+    specialization: Specialization | None
+    # Lines shown under the title when specialized
+    spec_lines: tuple[str, ...]
+    stats: tuple[Stat, ...]
+    # Left out entirely when every stat is 0
+    optional: bool = False
+
+
+def constant(value: float) -> tuple[float, float, float]:
+    return (value, value, value)
+
+
+def accuracy_cost(base: tuple[float, float, float]) -> Stat:
+    return Stat("Accuracy Cost {}%", base, percent=True)
+
+
+def duration(base: tuple[float, float, float] | BaseValue, **kwargs) -> Stat:
+    return Stat("Duration {} sec", base, **kwargs)
+
+
+def radius(base: tuple[float, float, float] | BaseValue, **kwargs) -> Stat:
+    return Stat("Radius {}m", base, **kwargs)
+
+
+def recharge(base: tuple[float, float, float], **kwargs) -> Stat:
+    return Stat("Recharge {} sec", base, **kwargs)
+
+
+def bonus(template: str, *modifiers: Modifier, **kwargs) -> Stat:
+    # A sum of modifiers with nothing underneath, shown only when there is some
+    return Stat(template, constant(0), additions=modifiers, optional=True, **kwargs)
+
+
+def tech_mine_damage(base: tuple[float, float, float], **kwargs) -> Stat:
+    return Stat("Tech Mine Damage {}", base, bonuses=(Modifier.TECH_MINE_DAMAGE, Modifier.ALL_DAMAGE), **kwargs)
+
+
+standard_recharge = (60, 50, 40)
+
+SHEPARD = Ability(
+    "Shepard", None, None, (),
+    (
+        bonus("Health + {}%", Modifier.HEALTH, percent=True),
+        bonus("Shields + {}", Modifier.SHIELD_CAPACITY),
+        bonus("Tech Protection + {}%", Modifier.TECH_PROTECTION, percent=True),
+        bonus("Biotic Protection + {}%", Modifier.BIOTIC_PROTECTION, percent=True),
+        bonus("Health Regen {} per sec", Modifier.HEALTH_REGEN),
+        bonus("Melee Damage + {}%", Modifier.MELEE_DAMAGE, Modifier.ALL_DAMAGE, percent=True),
+        bonus("Max Accuracy + {}%", Modifier.MAX_ACCURACY),
+        bonus("Accuracy Regen + {}%", Modifier.ACCURACY_REGEN),
+    ),
+    optional=True,
+)
+
+PISTOL = Ability(
+    "Pistol", None, None, (),
+    (
+        bonus("Damage + {}%", Modifier.PISTOL_DAMAGE, Modifier.ALL_DAMAGE, percent=True, rounded=True),
+        bonus("Accuracy + {}%", Modifier.PISTOL_ACCURACY, percent=True, rounded=True),
+        bonus("Cooling + {}%", Modifier.PISTOL_COOLING, percent=True),
+    ),
+    optional=True,
+)
+
+ASSAULT_RIFLE = Ability(
+    "Assault Rifles", None, None, (),
+    (
+        bonus("Damage + {}%", Modifier.ASSAULT_RIFLE_DAMAGE, Modifier.ALL_DAMAGE, percent=True),
+        bonus("Accuracy + {}%", Modifier.ASSAULT_RIFLE_ACCURACY, percent=True),
+    ),
+    optional=True,
+)
+
+SHOTGUN = Ability(
+    "Shotgun", None, None, (),
+    (
+        bonus("Damage + {}%", Modifier.SHOTGUN_DAMAGE, Modifier.ALL_DAMAGE, percent=True, rounded=True),
+        bonus("Accuracy + {}%", Modifier.SHOTGUN_ACCURACY, percent=True, rounded=True),
+    ),
+    optional=True,
+)
+
+SNIPER_RIFLES = Ability(
+    "Sniper Rifles", None, None, (),
+    (
+        bonus("Damage + {}%", Modifier.SNIPER_RIFLE_DAMAGE, Modifier.ALL_DAMAGE, percent=True),
+        bonus("Accuracy + {}%", Modifier.SNIPER_RIFLE_ACCURACY, percent=True),
+        bonus("Cooling + {}%", Modifier.SNIPER_RIFLE_COOLING, percent=True),
+    ),
+    optional=True,
+)
+
+LIGHT_ARMOR = Ability(
+    "Light Armor", None, None, (),
+    (
+        bonus("Damage Protection + {}%", Modifier.LIGHT_ARMOR_DR, percent=True),
+        bonus("Hardening + {}%", Modifier.LIGHT_ARMOR_HARDENING, percent=True),
+    ),
+    optional=True,
+)
+
+MEDIUM_ARMOR = Ability(
+    "Medium Armor", None, None, (),
+    (
+        bonus("Damage Protection + {}%", Modifier.MED_ARMOR_DR, percent=True),
+        bonus("Hardening + {}%", Modifier.MED_ARMOR_HARDENING, percent=True),
+    ),
+    optional=True,
+)
+
+HEAVY_ARMOR = Ability(
+    "Heavy Armor", None, None, (),
+    (
+        bonus("Damage Protection + {}%", Modifier.HEAVY_ARMOR_DR, percent=True),
+        bonus("Hardening + {}%", Modifier.HEAVY_ARMOR_HARDENING, percent=True),
+    ),
+    optional=True,
+)
+
+# TODO: Find out what the base repair value is and display it.
+MAKO = Ability(
+    "Mako", None, None, (),
+    (
+        Stat("Mako Hull Repair + {}", constant(0), additions=(Modifier.HULL_REPAIR, ), exact=True),
+    ),
+    optional=True,
+)
+
+ADRENALINE_BURST = Ability(
+    "Adrenaline Burst", AbilityLevel.ADRENALINE_BURST, Specialization.ADRENALINE_BURST,
+    ("Adrenaline Burst Specialization", ),
+    (
+        recharge((120, 90, 45), spec_haste=0.25),
+        accuracy_cost(constant(0.30)),
+    ),
+)
+
+AI_HACKING = Ability(
+    "AI Hacking", AbilityLevel.AI_HACKING, None, (),
+    (
+        duration((20, 25, 30), bonuses=(Modifier.ALL_DURATIONS, )),
+        recharge(standard_recharge, haste=(Modifier.AI_HACKING_HASTE, )),
+        accuracy_cost(constant(0.80)),
+    ),
+)
+
+ASSASSINATION = Ability(
+    "Assassination", AbilityLevel.ASSASSINATION, Specialization.ASSASSINATION,
+    ("Assassination Specialization", ),
+    (
+        Stat("Damage {}% DPS", (2.00, 2.50, 3.00), percent=True),
+        duration(constant(6)),
+        recharge(constant(45), spec_haste=0.25),
+    ),
+)
+
+BARRIER = Ability(
+    "Barrier", AbilityLevel.BARRIER, Specialization.BARRIER,
+    ("Barrier Specialization", ),
+    (
+        Stat("Shielding {}", BaseValue.BARRIER_SHIELDING, spec_bonus=0.25, exact=True),
+        duration(BaseValue.BARRIER_DURATION, bonuses=(Modifier.BARRIER_DURATION, Modifier.ALL_DURATIONS), spec_bonus=0.25),
+        Stat("Regen {} pts / sec", constant(0), spec_add=40, exact=True, optional=True),
+        recharge(standard_recharge, haste=(Modifier.BARRIER_HASTE, )),
+        accuracy_cost(constant(0.80)),
+    ),
+)
+
+CARNAGE = Ability(
+    "Carnage", AbilityLevel.CARNAGE, None, (),
+    (
+        Stat("Damage {}% DPS", (2.00, 2.25, 2.50), percent=True),
+        radius((2, 2.5, 3)),
+        duration(constant(6), bonuses=(Modifier.ALL_DURATIONS, )),
+        recharge(constant(45)),
+    ),
+)
+
+DAMPING = Ability(
+    "Damping", AbilityLevel.DAMPING, None, (),
+    (
+        tech_mine_damage((50, 100, 100)),
+        Stat("Stun {} sec", constant(3), bonuses=(Modifier.ALL_DURATIONS, ), exact=True),
+        radius((6, 8, 10), bonuses=(Modifier.DAMPING_RADIUS, )),
+        recharge(standard_recharge, haste=(Modifier.DAMPING_HASTE, )),
+        accuracy_cost(constant(0.60)),
+    ),
+)
+
+FIRST_AID = Ability(
+    "First Aid", None, Specialization.FIRST_AID,
+    ("First Aid Specialization:", "    Ignore toxic damage", "    Revive fallen party members"),
+    (
+        Stat("Health Restored {}", constant(40), additions=(Modifier.FIRST_AID_HEALING, ), spec_add=80),
+        recharge(constant(20), haste=(Modifier.FIRST_AID_HASTE, )),
+    ),
+)
+
+IMMUNITY = Ability(
+    "Immunity", AbilityLevel.IMMUNITY, Specialization.IMMUNITY,
+    ("Immunity Specialization", ),
+    (
+        Stat("Damage Reduction {}%", (0.75, 0.85, 0.90), percent=True),
+        duration(constant(6), bonuses=(Modifier.ALL_DURATIONS, )),
+        recharge(constant(45), spec_haste=0.25),
+    ),
+)
+
+LIFT = Ability(
+    "Lift", AbilityLevel.LIFT, Specialization.LIFT,
+    ("Lift Specialization", ),
+    (
+        duration(BaseValue.LIFT_DURATION, bonuses=(Modifier.LIFT_DURATION, Modifier.ALL_DURATIONS)),
+        radius((4, 5, 6), spec_add=4),
+        recharge(standard_recharge, haste=(Modifier.LIFT_HASTE, )),
+        accuracy_cost((0.80, 0.60, 0.40)),
+    ),
+)
+
+MARKSMAN = Ability(
+    "Marksman", AbilityLevel.MARKSMAN, Specialization.ASSASSINATION,
+    ("Assassination Specialization", ),
+    (
+        Stat("Accuracy + {}%", constant(0.60), percent=True, optional=True),
+        Stat("Damage + {}%", (0.25, 0.50, 0.75), percent=True, optional=True),
+        Stat("Headshot Damage + {}%", (0.50, 0.75, 1.00), percent=True),
+        duration(constant(6)),
+        recharge(constant(45), spec_haste=0.25),
+    ),
+)
+
+NEURAL_SHOCK = Ability(
+    "Neural Shock", AbilityLevel.NEURAL_SHOCK, Specialization.NEURAL_SHOCK,
+    ("Neural Shock Specialization", ),
+    (
+        Stat("Toxic Damage {}", (40, 80, 120), bonuses=(Modifier.ALL_DAMAGE, ), spec_add=40, exact=True),
+        Stat("Knockout {} sec", (1, 3, 5), bonuses=(Modifier.ALL_DURATIONS, ), spec_bonus=0.25, exact=True),
+        recharge(constant(45), haste=(Modifier.NEURAL_SHOCK_HASTE, )),
+        accuracy_cost(constant(0.60)),
+    ),
+)
+
+OVERKILL = Ability(
+    "Overkill", AbilityLevel.OVERKILL, None, (),
+    (
+        Stat("Cooling {}%", (0.80, 0.90, 1.00), percent=True),
+        Stat("Damage + {}%", (0.50, 0.75, 1.00), percent=True, optional=True),
+        duration(constant(6), bonuses=(Modifier.ALL_DURATIONS, )),
+        recharge(constant(45)),
+    ),
+)
+
+OVERLOAD = Ability(
+    "Overload", AbilityLevel.OVERLOAD, Specialization.OVERLOAD,
+    ("Overload Specialization", ),
+    (
+        tech_mine_damage((50, 100, 150), spec_add=50),
+        Stat("Shield Damage {}", (200, 400, 600), bonuses=(Modifier.ALL_DAMAGE, ), spec_add=200, exact=True),
+        Stat("Reduce Damage Protection {}%", (0.20, 0.25, 0.30), spec_add=0.05, percent=True),
+        radius((6, 8, 10), bonuses=(Modifier.OVERLOAD_RADIUS, ), spec_add=2),
+        duration(constant(10), bonuses=(Modifier.ALL_DURATIONS, )),
+        recharge(standard_recharge, haste=(Modifier.OVERLOAD_HASTE, )),
+        accuracy_cost(constant(0.60)),
+    ),
+)
+
+SABOTAGE = Ability(
+    "Sabotage", AbilityLevel.SABOTAGE, Specialization.SABOTAGE,
+    ("Sabotage Specialization", ),
+    (
+        tech_mine_damage((50, 100, 150), spec_add=50),
+        Stat("Burn DPS {}", (2, 3, 4), bonuses=(Modifier.ALL_DAMAGE, ), spec_add=1, exact=True),
+        radius((6, 8, 10), bonuses=(Modifier.SABOTAGE_RADIUS, ), spec_add=2),
+        duration((15, 20, 25), bonuses=(Modifier.ALL_DURATIONS, ), spec_add=5),
+        recharge(standard_recharge, haste=(Modifier.SABOTAGE_HASTE, )),
+        accuracy_cost(constant(0.60)),
+    ),
+)
+
+SHIELD_BOOST = Ability(
+    "Shield Boost", AbilityLevel.SHIELD_BOOST, None, (),
+    (
+        Stat("Shields Restored {}%", (0.30, 0.40, 0.50), percent=True),
+        duration(constant(2)),
+        recharge(constant(45)),
+        accuracy_cost(constant(0.30)),
+    ),
+)
+
+SINGULARITY = Ability(
+    "Singularity", AbilityLevel.SINGULARITY, None, (),
+    (
+        radius(BaseValue.SINGULARITY_RADIUS),
+        duration((4, 6, 8), bonuses=(Modifier.SINGULARITY_DURATION, )),
+        recharge(standard_recharge, haste=(Modifier.SINGULARITY_HASTE, )),
+        accuracy_cost(constant(0.80)),
+    ),
+)
+
+STASIS = Ability(
+    "Stasis", AbilityLevel.STASIS, Specialization.STASIS,
+    ("Stasis Specialization:", "    Damage enemies in Stasis"),
+    (
+        duration(BaseValue.STASIS_DURATION, bonuses=(Modifier.STASIS_DURATION, Modifier.ALL_DURATIONS)),
+        recharge(standard_recharge, haste=(Modifier.STASIS_HASTE, )),
+        accuracy_cost(constant(0.80)),
+    ),
+)
+
+THROW = Ability(
+    "Throw", AbilityLevel.THROW, None, (),
+    (
+        Stat("Force {}N", BaseValue.THROW_FORCE, bonuses=(Modifier.THROW_FORCE, )),
+        Stat("Damage + {}%", constant(0), additions=(Modifier.THROW_DAMAGE, Modifier.ALL_DAMAGE), percent=True, optional=True),
+        radius((4, 5, 6)),
+        recharge(standard_recharge, haste=(Modifier.THROW_HASTE, )),
+        accuracy_cost((0.60, 0.45, 0.30)),
+    ),
+)
+
+UNITY = Ability(
+    "Unity", AbilityLevel.UNITY, None, (),
+    (
+        Stat("Health {}%", (0.15, 0.20, 0.30), percent=True),
+        Stat("Shields {}%", (0.40, 0.60, 1.00), percent=True),
+        recharge((150, 120, 90)),
+        accuracy_cost(constant(0.45)),
+    ),
+)
+
+WARP = Ability(
+    "Warp", AbilityLevel.WARP, Specialization.WARP,
+    ("Warp Specialization", ),
+    (
+        Stat("DPS {}", (6, 8, 10), bonuses=(Modifier.ALL_DAMAGE, ), spec_bonus=0.25, exact=True),
+        Stat("Reduce Damage Protection {}%", (0.50, 0.60, 0.75), percent=True),
+        radius((4, 5, 6), spec_add=2),
+        duration(BaseValue.WARP_DURATION, bonuses=(Modifier.WARP_DURATION, Modifier.ALL_DURATIONS)),
+        recharge(standard_recharge, haste=(Modifier.WARP_HASTE, )),
+        accuracy_cost(constant(0.80)),
+    ),
+)
+
+# In display order
+catalog: tuple[Ability, ...] = (
+    SHEPARD, FIRST_AID, PISTOL, ASSAULT_RIFLE, SHOTGUN, SNIPER_RIFLES,
+    ADRENALINE_BURST, IMMUNITY, MARKSMAN, OVERKILL, CARNAGE, ASSASSINATION,
+    LIGHT_ARMOR, MEDIUM_ARMOR, HEAVY_ARMOR,
+    SHIELD_BOOST, SABOTAGE, OVERLOAD, AI_HACKING, DAMPING, NEURAL_SHOCK,
+    BARRIER, LIFT, SINGULARITY, STASIS, THROW, WARP, UNITY, MAKO,
+)
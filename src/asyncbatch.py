@@ -0,0 +1,141 @@
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from concurrent.futures import Executor
+from typing import NamedTuple
+
+from batch import _evaluate_chunk, check_build, Evaluation, structure
+from model import Build
+
+
+# Streams are evaluated on the event loop only up to this many builds; chunks
+# past it go to a thread, so a large stream doesn't block the loop
+INLINE_BUILDS: int = 32
+
+
+class _Done(NamedTuple):
+    # A worker has finished, with the error that stopped it if any
+    error: BaseException | None
+
+
+async def _aiter(builds: Iterable[Build]) -> AsyncIterator[Build]:
+    for build in builds:
+        yield build
+
+
+async def _read(builds: AsyncIterable[Build] | Iterable[Build], chunks: asyncio.Queue, chunk_size: int, workers: int):
+    chunk: list[tuple[int, Build]] = []
+    index = 0
+    async for build in builds if isinstance(builds, AsyncIterable) else _aiter(builds):
+        chunk.append((index, check_build(build)))
+        index += 1
+        if len(chunk) == chunk_size:
+            await chunks.put(chunk)
+            chunk = []
+    if chunk:
+        await chunks.put(chunk)
+    for _ in range(workers):
+        await chunks.put(None)
+
+
+def _structure_chunk(chunk: list[tuple[int, Build]]) -> list[Evaluation]:
+    summaries = _evaluate_chunk([build for _, build in chunk])
+    return [structure(index, build, summary) for (index, build), summary in zip(chunk, summaries)]
+
+
+async def _work(chunks: asyncio.Queue, results: asyncio.Queue, executor: Executor | None, inline_builds: int):
+    loop = asyncio.get_running_loop()
+    try:
+        while (chunk := await chunks.get()) is not None:
+            if executor is not None:
+                summaries = await loop.run_in_executor(executor, _evaluate_chunk, [build for _, build in chunk])
+                evaluations = [structure(index, build, summary) for (index, build), summary in zip(chunk, summaries)]
+            elif chunk[-1][0] < inline_builds:
+                evaluations = _structure_chunk(chunk)
+            else:
+                evaluations = await asyncio.to_thread(_structure_chunk, chunk)
+            for evaluation in evaluations:
+                await results.put(evaluation)
+            # Let the reader and other workers in between inline chunks
+            await asyncio.sleep(0)
+    except Exception as error:
+        await results.put(_Done(error))
+    else:
+        await results.put(_Done(None))
+
+
+async def evaluate_stream(builds: AsyncIterable[Build] | Iterable[Build], concurrency: int = 4,
+                          executor: Executor | None = None, chunk_size: int = 16,
+                          queue_size: int = 64, inline_builds: int = INLINE_BUILDS) -> AsyncIterator[Evaluation]:
+    # Evaluations in the order they complete; Evaluation.index gives the input
+    # order. At most concurrency chunks of chunk_size builds are evaluated at a
+    # time, on the executor (thread or process pool) if given. Without one, the
+    # first inline_builds builds are evaluated on the event loop and later
+    # chunks with asyncio.to_thread. Both queues are bounded, so a consumer that stops reading
+    # stops the workers, which stops the builds being read. Closing the
+    # iterator cancels everything still running; consumers that may be
+    # cancelled should iterate inside contextlib.aclosing so that happens.
+    if concurrency < 1 or chunk_size < 1 or queue_size < 1:
+        raise ValueError("concurrency, chunk_size and queue_size must be at least 1")
+    chunks: asyncio.Queue = asyncio.Queue(max(1, queue_size // chunk_size))
+    results: asyncio.Queue = asyncio.Queue(queue_size)
+    reader = asyncio.create_task(_read(builds, chunks, chunk_size, concurrency))
+    workers = [asyncio.create_task(_work(chunks, results, executor, inline_builds)) for _ in range(concurrency)]
+    try:
+        running = concurrency
+        while running:
+            get = asyncio.create_task(results.get())
+            if not reader.done():
+                await asyncio.wait((get, reader), return_when=asyncio.FIRST_COMPLETED)
+            # A bad build stops the reader before the workers get their None,
+            # so they would wait forever; checked on every pass, not only the
+            # one where the reader finished
+            if reader.done() and reader.exception() is not None:
+                get.cancel()
+                reader.result()
+            result = await get
+            if isinstance(result, _Done):
+                if result.error is not None:
+                    raise result.error
+                running -= 1
+                continue
+            yield result
+    finally:
+        for task in (reader, *workers):
+            task.cancel()
+        await asyncio.gather(reader, *workers, return_exceptions=True)
+
+
+async def evaluate_many(builds: AsyncIterable[Build] | Iterable[Build], **options) -> list[Evaluation]:
+    # Every evaluation, in input order; options are those of evaluate_stream
+    evaluations = [evaluation async for evaluation in evaluate_stream(builds, **options)]
+    evaluations.sort(key=lambda evaluation: evaluation.index)
+    return evaluations
+
+
+async def evaluate_one(build: Build, executor: Executor | None = None) -> Evaluation:
+    build = check_build(build)
+    if executor is None:
+        summaries = _evaluate_chunk([build])[0]
+    else:
+        summaries = (await asyncio.get_running_loop().run_in_executor(executor, _evaluate_chunk, [build]))[0]
+    return structure(0, build, summaries)
+
+
+if __name__ == "__main__":
+    import time
+    from presets import presets
+
+    async def consume_slowly(builds: list) -> None:
+        async for _ in evaluate_stream(builds, concurrency=2, chunk_size=4, queue_size=8):
+            await asyncio.sleep(0.01)
+
+    # A bad build after the reader has fallen behind the consumer must raise, not hang
+    talents = presets["Adept"].with_specialization(presets["Adept"].specializations[0])
+    builds = [Build(talents, (1, ) * len(talents))] * 40 + [Build(talents, (99, ) * len(talents))]
+    start = time.perf_counter()
+    try:
+        asyncio.run(asyncio.wait_for(consume_slowly(builds), 5))
+    except ValueError as error:
+        print(f"bad build raised after {time.perf_counter() - start:.2f}s: {error}")
+    else:
+        raise AssertionError("bad build was not reported")
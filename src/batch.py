@@ -0,0 +1,104 @@
+import sys
+import time
+from collections.abc import Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from itertools import chain
+from typing import NamedTuple
+
+import abilities as ab
+from codegen import evaluator, stats_evaluator
+from model import Build, MAX_RANK, point_totals
+import summarize as sm
+import talents as tl
+
+
+# The output of each summarizer, in summarize.summarizers order
+Summaries = tuple[str, ...]
+
+
+class Evaluation(NamedTuple):
+    # Position of the build in the input
+    index: int
+    build: Build
+    # Ability title -> summary, for the summaries summarize_all would show
+    summaries: dict[str, str]
+    # Every stat of the unlocked abilities, unrounded, as
+    # summarize.calculate_stats gives them, e.g. {("Warp", "Duration {} sec"): 14.0}
+    stats: dict[sm.StatKey, float]
+
+
+titles: tuple[str, ...] = tuple(sm.get_title(summarizer) for summarizer in sm.summarizers)
+
+
+def evaluate(talents: Sequence[type[tl.Talent]], ranks: Sequence[int]) -> Summaries:
+    return evaluator(tuple(talents))(ranks)
+
+
+def structure(index: int, build: Build, summaries: Summaries) -> Evaluation:
+    shown = {title: summary for title, summary in zip(titles, summaries) if summary}
+    stats = {
+        (ability.title, stat.template): value
+        for ability, values in zip(ab.catalog, stats_evaluator(tuple(build.talents), ab.catalog)(build.ranks))
+        for stat, value in zip(ability.stats, values)
+    }
+    return Evaluation(index, build, shown, stats)
+
+
+def check_build(build: Build) -> Build:
+    # The same rules as TreeModel.set_preset, for builds that did not come from one
+    talents, ranks = tuple(build[0]), tuple(build[1])
+    if not all(isinstance(talent, type) and issubclass(talent, tl.Talent) for talent in talents):
+        raise ValueError("Expected talent classes")
+    if len(ranks) != len(talents):
+        raise ValueError(f"Expected {len(talents)} ranks, got {len(ranks)}")
+    if not all(type(rank) is int and 0 <= rank <= MAX_RANK for rank in ranks):
+        raise ValueError(f"Ranks must be within 0-{MAX_RANK}")
+    if sum(ranks) > point_totals[-1]:
+        raise ValueError(f"{sum(ranks)} points allocated, at most {point_totals[-1]} available")
+    return Build(talents, ranks)
+
+
+def _evaluate_chunk(builds: Sequence[Build]) -> list[Summaries]:
+    return [evaluator(talents)(ranks) for talents, ranks in builds]
+
+
+def evaluate_batch(builds: Sequence[Build], executor: Executor | None = None, workers: int | None = None,
+                   chunk_size: int = 64) -> list[Summaries]:
+    # Summaries for every build, in order. Evaluation only reads state that is
+    # never written after it is built (talent tables, contributions, generated
+    # evaluators), so chunks run on threads without any locking. Without an
+    # executor, a pool of workers threads is made for this batch.
+    builds = [Build(tuple(talents), ranks) for talents, ranks in builds]
+    # Compile each talent set once up front rather than racing to in the pool
+    for talents in {talents for talents, _ in builds}:
+        evaluator(talents)
+    chunks = [builds[start:start + chunk_size] for start in range(0, len(builds), chunk_size)]
+    if executor is None:
+        with ThreadPoolExecutor(workers) as executor:
+            return list(chain.from_iterable(executor.map(_evaluate_chunk, chunks)))
+    return list(chain.from_iterable(executor.map(_evaluate_chunk, chunks)))
+
+
+if __name__ == "__main__":
+    # Throughput by thread count. Only a free-threaded build (python3.13t) can
+    # scale past one thread; with the GIL this shows the cost of the pool.
+    import random
+    from presets import presets
+
+    rng = random.Random(0)
+    talent_sets = [preset.with_specialization(spec) for preset in presets.values() for spec in preset.specializations]
+    builds = [Build(talents, tuple(rng.randint(0, MAX_RANK) for _ in talents)) for talents in talent_sets for _ in range(4000)]
+    rng.shuffle(builds)
+    expected = _evaluate_chunk(builds)
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}, {len(builds)} builds")
+    baseline = 0.0
+    for workers in (1, 2, 4, 8, 16):
+        with ThreadPoolExecutor(workers) as pool:
+            start = time.perf_counter()
+            results = evaluate_batch(builds, pool)
+            elapsed = time.perf_counter() - start
+        assert results == expected
+        baseline = baseline or elapsed
+        print(f"{workers:>3} threads  {len(builds) / elapsed:>10,.0f} builds/s  x{baseline / elapsed:.2f}")
@@ -0,0 +1,373 @@
+import functools
+import hashlib
+import importlib.util
+import marshal
+import os
+import threading
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+import abilities as ab
+from enums import AbilityLevel, BaseValue, Modifier, Specialization
+import summarize as sm
+from tables import MAX_RANK
+import talents as tl
+from totals import contribution
+
+
+# Ranks -> the output of each summarizer, in summarize.summarizers order
+Evaluator = Callable[[Sequence[int]], tuple[str, ...]]
+# Ranks -> summarize.calculate_ability's values for each of some abilities, in
+# the order of the ability's stats; () when it is locked
+StatsEvaluator = Callable[[Sequence[int]], tuple[tuple[float, ...], ...]]
+# Ranks -> an Evaluator's output for each variant
+VariantEvaluator = Callable[[Sequence[int]], tuple[tuple[str, ...], ...]]
+# Talents and ability catalog that one variant of the game data is evaluated with
+Variant = tuple[tuple[type[tl.Talent], ...], tuple[ab.Ability, ...]]
+Key = Modifier | BaseValue | AbilityLevel | Specialization
+
+VERSION: int = 2
+cache_dir: Path = Path(__file__).with_name("__pycache__") / "evaluators"
+
+
+# Source of an expression only known at run time; anything else is a value
+# known while generating, which is folded into the code as a constant
+class Expr(str):
+    pass
+
+
+Value = int | float | bool | str | Expr
+
+
+def _code(value: Value) -> str:
+    return value if isinstance(value, Expr) else repr(value)
+
+
+def _binary(left: Value, operator: str, right: Value) -> Value:
+    # The same operation whether it is folded now or done at run time. Adding
+    # an int 0 changes neither value nor type (-0.0 aside, which sums starting
+    # from 0.0 never produce), so it is left out.
+    if isinstance(left, Expr) or isinstance(right, Expr):
+        if operator == "+" and type(right) is int and right == 0:
+            return left
+        if operator == "+" and type(left) is int and left == 0:
+            return right
+        return Expr(f"({_code(left)} {operator} {_code(right)})")
+    return {"+": left + right, "*": left * right, "-": left - right}[operator]
+
+
+def _join(parts: list[Value]) -> Value:
+    # String concatenation, with adjacent known strings joined now
+    merged: list[Value] = []
+    for part in parts:
+        if merged and not isinstance(part, Expr) and not isinstance(merged[-1], Expr):
+            merged[-1] += part
+        elif part != "":
+            merged.append(part)
+    if not merged:
+        return ""
+    return merged[0] if len(merged) == 1 else Expr(" + ".join(map(_code, merged)))
+
+
+class _Generator:
+
+    def __init__(self, talents: tuple[type[tl.Talent], ...], catalog: tuple[ab.Ability, ...] = ab.catalog,
+                 prefix: str = "", stats: bool = False):
+        self.talents = talents
+        self.catalog = catalog
+        # Stat values rather than summaries
+        self.stats = stats
+        # Before every local's name, so several generators can share a function
+        self.prefix = prefix
+        self.lines: list[str] = []
+        # Key lookups, computed once before any branching
+        self.prologue: list[str] = []
+        # Key -> its value over the whole build, as summarize reads it from Totals
+        self.values: dict[Key, Value] = {}
+        self.counter = 0
+
+    def emit(self, indent: int, line: str):
+        self.lines.append("    " * indent + line)
+
+    def local(self, prefix: str, indent: int, value: Value) -> Value:
+        if not isinstance(value, Expr) or value.isidentifier():
+            return value
+        name = f"{self.prefix}{prefix}{self.counter}"
+        self.counter += 1
+        if prefix == "k":
+            self.prologue.append(f"    {name} = {value}")
+        else:
+            self.emit(indent, f"{name} = {value}")
+        return Expr(name)
+
+    def column(self, index: int, key: Key, fold: Callable[[Value], Value] = lambda value: value) -> Value:
+        # The talent's value for key, looked up by its rank in a constant tuple.
+        # fold is applied to every entry now rather than to the result later.
+        values = []
+        for rank in range(MAX_RANK + 1):
+            modifiers, abilities = contribution(self.talents[index], rank)
+            values.append(fold((modifiers if isinstance(key, (Modifier, BaseValue)) else abilities).get(key, 0)))
+        if len(set(map(repr, values))) == 1:
+            return values[0]
+        return Expr(f"{tuple(values)!r}[r{index}]")
+
+    def value(self, key: Key) -> Value:
+        if key in self.values:
+            return self.values[key]
+        is_modifier = isinstance(key, (Modifier, BaseValue))
+        tables = [talent.modifier_table if is_modifier else talent.ability_table for talent in self.talents]
+        value: Value
+        if not any(key in table for table in tables):
+            value = 0
+        else:
+            contributors = [index for index, table in enumerate(tables) if key in table]
+            items = [self.column(index, key) for index in contributors]
+            if isinstance(key, Modifier):
+                # Totals sums from 0.0; the talents without the key add 0
+                value = self.column(contributors[0], key, lambda value: 0.0 + value)
+                for item in items[1:]:
+                    value = _binary(value, "+", item)
+            elif isinstance(key, Specialization):
+                # Only read for truthiness
+                if any(item for item in items if not isinstance(item, Expr)):
+                    value = True
+                else:
+                    value = Expr(" or ".join(item for item in items if isinstance(item, Expr))) or False
+            elif len(items) == 1:
+                value = self.column(contributors[0], key, lambda value: max(0, value))
+            else:
+                # Totals takes the highest, summarize then takes max(0, that).
+                # Either way the first highest value wins, and 0 if none is above it.
+                value = Expr(f"max(0, {', '.join(map(_code, items))})")
+        value = self.local("k", 1, value)
+        self.values[key] = value
+        return value
+
+    def sum(self, keys: tuple[Modifier, ...]) -> Value:
+        # summarize.calculate_bonus
+        value: Value = 0.0
+        for key in keys:
+            # A Totals sum is already a float, and 0.0 + it is itself
+            added = self.value(key)
+            value = added if value == 0.0 and type(value) is float and isinstance(added, Expr) else _binary(value, "+", added)
+        return value
+
+    def stat(self, stat: ab.Stat, level: int, specialized: bool) -> Value:
+        # summarize.calculate_stat, with the level and specialization known
+        value = self.value(stat.base) if isinstance(stat.base, BaseValue) else stat.base[level - 1]
+        for keys, spec_delta, operator in (
+            (stat.additions, stat.spec_add, None),
+            (stat.bonuses, stat.spec_bonus, "+"),
+            (stat.haste, stat.spec_haste, "-"),
+        ):
+            if not (keys or spec_delta):
+                continue
+            delta = self.sum(keys) if keys else 0
+            if specialized:
+                delta = _binary(delta, "+", spec_delta)
+            if operator is None:
+                value = _binary(value, "+", delta)
+            else:
+                value = _binary(value, "*", _binary(1.0, operator, delta))
+        return value
+
+    def line(self, stat: ab.Stat, value: Value, indent: int) -> Value:
+        # summarize.format_stat with the summary's line break in front; "" when left out
+        if not isinstance(value, Expr):
+            text = sm.format_stat(stat, value)
+            return "\n    " + text if text else ""
+        if stat.rounded:
+            value = self.local("v", indent, Expr(f"truncate({value})"))
+        if stat.percent:
+            shown = f"truncate({value} * 100)"
+        else:
+            shown = value if stat.exact else f"truncate({value})"
+        before, after = stat.template.split("{}")
+        text = _join(["\n    " + before, Expr(f"str({shown})"), after])
+        return Expr(f"('' if {value} == 0 else {text})") if stat.optional else text
+
+    def summary(self, ability: ab.Ability, level: int, specialized: bool, index: int, indent: int):
+        # summarize.summarize_ability, for one level and specialization
+        values = [self.local("v", indent, self.stat(stat, level, specialized)) for stat in ability.stats]
+        title = sm.format_title(ability.title, level) if ability.level else ability.title
+        spec_lines = ["\n    " + line for line in ability.spec_lines] if specialized else []
+        summary = _join([title, *spec_lines, *(self.line(stat, value, indent) for stat, value in zip(ability.stats, values))])
+        if ability.optional:
+            unknown = [value for value in values if isinstance(value, Expr)]
+            if not any(value for value in values if not isinstance(value, Expr)):
+                if not unknown:
+                    summary = ""
+                else:
+                    summary = Expr(f"{_code(summary)} if {' or '.join(unknown)} else ''")
+        self.emit(indent, f"{self.prefix}s{index} = {_code(summary)}")
+
+    def stat_values(self, ability: ab.Ability, level: int, specialized: bool, index: int, indent: int):
+        # summarize.calculate_ability, for one level and specialization
+        values = "".join(f"{_code(self.stat(stat, level, specialized))}, " for stat in ability.stats)
+        self.emit(indent, f"{self.prefix}s{index} = ({values})")
+
+    def branches(self, indent: int, value: Value, choices: list, body: Callable[[object, int], None]):
+        # One branch per value the run-time value can take, the last as the fallback
+        if not isinstance(value, Expr):
+            body(value, indent)
+            return
+        for position, choice in enumerate(choices):
+            if position == len(choices) - 1:
+                self.emit(indent, "else:")
+            elif choice is True:
+                self.emit(indent, f"if {value}:")
+            else:
+                self.emit(indent, f"{'if' if position == 0 else 'elif'} {value} == {choice!r}:")
+            body(choice, indent + 1)
+
+    def ability(self, ability: ab.Ability, index: int):
+        self.emit(1, f"# {ability.title}")
+        level = self.value(ability.level) if ability.level else 1
+        levels = sorted({level for talent in self.talents for level in talent.ability_table.get(ability.level, {}).values()})
+        specialized = self.value(ability.specialization) if ability.specialization else False
+
+        body = self.stat_values if self.stats else self.summary
+
+        def level_body(level: int, indent: int):
+            if level == 0:
+                self.emit(indent, f"{self.prefix}s{index} = {'()' if self.stats else repr('')}")
+                return
+            self.branches(indent, specialized, [True, False], lambda spec, indent: body(ability, level, spec, index, indent))
+
+        self.branches(1, level, [*levels, 0], level_body)
+
+    def body(self) -> list[str]:
+        # Lines computing every summary into s0, s1, ... (after the prefix)
+        for index, ability in enumerate(self.catalog):
+            self.ability(ability, index)
+        return self.prologue + self.lines
+
+    def result(self) -> str:
+        return f"({''.join(f'{self.prefix}s{index}, ' for index in range(len(self.catalog)))})"
+
+
+def _header(talents: tuple[type[tl.Talent], ...]) -> list[str]:
+    ranks = "".join(f"r{index}, " for index in range(len(talents)))
+    return [
+        "def evaluate(ranks):",
+        f"    # {', '.join(talent.__name__ for talent in talents)}",
+        f"    {ranks}= ranks",
+    ]
+
+
+def source(talents: tuple[type[tl.Talent], ...], catalog: tuple[ab.Ability, ...] = ab.catalog) -> str:
+    # Python source of a function computing every summary for these talents,
+    # with the talent tables and ability catalog folded in as constants
+    generator = _Generator(tuple(talents), catalog)
+    body = generator.body()
+    return "\n".join(_header(generator.talents) + body + [f"    return {generator.result()}"]) + "\n"
+
+
+def stats_source(talents: tuple[type[tl.Talent], ...], abilities: tuple[ab.Ability, ...]) -> str:
+    generator = _Generator(tuple(talents), abilities, stats=True)
+    body = generator.body()
+    return "\n".join(_header(generator.talents) + body + [f"    return {generator.result()}"]) + "\n"
+
+
+def variants_source(variants: Sequence[Variant]) -> str:
+    # One function computing every variant's summaries for the same ranks.
+    # Each distinct (talents, catalog) is generated once under its own
+    # prefix; variants that leave a build's data alone share the base's code.
+    lines: list[str] = []
+    results: list[str] = []
+    generated: dict[Variant, str] = {}
+    for position, (talents, catalog) in enumerate(variants):
+        key = (tuple(talents), catalog)
+        if key not in generated:
+            generator = _Generator(key[0], catalog, f"x{position}_")
+            lines += generator.body()
+            generated[key] = generator.result()
+        results.append(generated[key])
+    return "\n".join(_header(tuple(variants[0][0])) + lines + [f"    return ({''.join(f'{result}, ' for result in results)})"]) + "\n"
+
+
+def _plain(table) -> dict:
+    return {key: dict(lookup) for key, lookup in table.items()}
+
+
+def table_hash(talents: tuple[type[tl.Talent], ...], catalog: tuple[ab.Ability, ...] = ab.catalog) -> str:
+    # Everything the generated code depends on
+    digest = hashlib.sha256()
+    digest.update(f"{VERSION} {importlib.util.MAGIC_NUMBER!r} {catalog!r}".encode())
+    for talent in talents:
+        digest.update(f"{talent.__name__} {_plain(talent.modifier_table)!r} {_plain(talent.ability_table)!r}".encode())
+    return digest.hexdigest()
+
+
+def _compile(key: str, make_source: Callable[[], str], use_disk: bool):
+    path = cache_dir / f"{key}.bin"
+    if use_disk:
+        try:
+            return marshal.loads(path.read_bytes())
+        except (OSError, ValueError, EOFError, TypeError):
+            pass
+    code = compile(make_source(), f"<evaluator {path.stem[:12]}>", "exec")
+    if use_disk:
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            # Per thread as well, since threads may compile the same tables at once
+            partial = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            partial.write_bytes(marshal.dumps(code))
+            os.replace(partial, path)
+        except OSError:
+            pass
+    return code
+
+
+@functools.cache
+def evaluator(talents: tuple[type[tl.Talent], ...], use_disk: bool = True) -> Evaluator:
+    # Same output as running each summarizer on the build's Totals. Ranks must
+    # be within 0-MAX_RANK, which TreeModel already guarantees.
+    talents = tuple(talents)
+    namespace = {"truncate": sm.truncate}
+    exec(_compile(table_hash(talents), lambda: source(talents), use_disk), namespace)
+    return namespace["evaluate"]
+
+
+@functools.cache
+def stats_evaluator(talents: tuple[type[tl.Talent], ...], abilities: tuple[ab.Ability, ...], use_disk: bool = True) -> StatsEvaluator:
+    # The values summarize.calculate_ability finds on the build's Totals, for
+    # abilities only, without building the Totals
+    talents = tuple(talents)
+    key = hashlib.sha256(f"stats {table_hash(talents, abilities)}".encode()).hexdigest()
+    namespace = {"truncate": sm.truncate}
+    exec(_compile(key, lambda: stats_source(talents, abilities), use_disk), namespace)
+    return namespace["evaluate"]
+
+
+@functools.cache
+def variant_evaluator(variants: tuple[Variant, ...], use_disk: bool = True) -> VariantEvaluator:
+    # Every variant's evaluator output for one build in a single call. The
+    # variants must have the same number of talents, in the same positions.
+    if len({len(talents) for talents, _ in variants}) > 1:
+        raise ValueError("Variants must have the same number of talents")
+    key = hashlib.sha256(" ".join(table_hash(talents, catalog) for talents, catalog in variants).encode()).hexdigest()
+    namespace = {"truncate": sm.truncate}
+    exec(_compile(key, lambda: variants_source(variants), use_disk), namespace)
+    return namespace["evaluate"]
+
+
+if __name__ == "__main__":
+    import random
+    from presets import presets
+    from totals import Totals
+
+    rng = random.Random(0)
+    for preset in presets.values():
+        for spec in preset.specializations:
+            talents = preset.with_specialization(spec)
+            builds = [tuple(rng.randint(0, MAX_RANK) for _ in talents) for _ in range(500)]
+            evaluate = evaluator(talents)
+            start = time.perf_counter()
+            generated = [evaluate(ranks) for ranks in builds]
+            middle = time.perf_counter()
+            generic = [tuple(summarize([Totals.from_ranks(talents, ranks)]) for summarize in sm.summarizers) for ranks in builds]
+            end = time.perf_counter()
+            assert generated == generic, spec.__name__
+            print(f"{spec.__name__:<24} generated {(middle - start) / len(builds) * 1e6:7.1f} us   summarize.py {(end - middle) / len(builds) * 1e6:7.1f} us")
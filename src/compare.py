@@ -0,0 +1,77 @@
+import functools
+from collections.abc import Callable, Iterable, Sequence
+from typing import NamedTuple
+
+from enums import AbilityLevel, Specialization
+from model import Build
+import summarize as sm
+import talents as tl
+from totals import Totals
+from vectors import positions
+
+
+Summarizer = Callable[[Iterable[tl.Talent]], str]
+
+
+class Comparison(NamedTuple):
+    names: list[str]
+    # Stat -> value in each build, in names order, unrounded; stats of locked
+    # abilities count as 0
+    rows: dict[sm.StatKey, list[float]]
+
+    def changed(self) -> set[sm.StatKey]:
+        return {stat for stat, values in self.rows.items() if len(set(values)) > 1}
+
+
+@functools.cache
+def dependency_keys(summarizer: Summarizer) -> tuple[tuple[int, ...], tuple[AbilityLevel | Specialization, ...]]:
+    # Vector positions of the modifiers and base values it reads, and the abilities it reads
+    dependencies = sm.get_dependencies(summarizer)
+    return (
+        tuple(sorted(positions[key] for key in dependencies if key in positions)),
+        tuple(sorted((key for key in dependencies if key not in positions), key=lambda key: (type(key).__name__, key.name))),
+    )
+
+
+def project(totals: Totals, summarizer: Summarizer) -> tuple:
+    # The only values the summarizer's output depends on
+    selected, abilities = dependency_keys(summarizer)
+    return totals.modifiers.project(selected) + tuple(totals.ability_levels.get(key, 0) for key in abilities)
+
+
+def evaluate(builds: Iterable[Build]) -> list[dict[sm.StatKey, float]]:
+    # Builds share both the per-(talent, rank) contributions cached by
+    # totals.contribution and any ability whose inputs project to the same values.
+    summaries: dict[tuple, dict[sm.StatKey, float]] = {}
+    results: list[dict[sm.StatKey, float]] = []
+    for build in builds:
+        totals = Totals.from_ranks(build.talents, build.ranks)
+        stats: dict[sm.StatKey, float] = {}
+        for summarizer in sm.summarizers:
+            key = (summarizer, project(totals, summarizer))
+            if key not in summaries:
+                summaries[key] = sm.ability_stats(summarizer.ability, [totals])
+            stats.update(summaries[key])
+        results.append(stats)
+    return results
+
+
+def compare(builds: Sequence[Build], names: Sequence[str] | None = None) -> Comparison:
+    names = list(names) if names is not None else [f"Build {i}" for i in range(1, len(builds) + 1)]
+    results = evaluate(builds)
+    # Keep stats in the order they first appear
+    stats = dict.fromkeys(stat for result in results for stat in result)
+    rows = {stat: [result.get(stat, 0.0) for result in results] for stat in stats}
+    return Comparison(names, rows)
+
+
+def format_comparison(comparison: Comparison) -> str:
+    # Changed rows are marked with "*"
+    changed = comparison.changed()
+    names = {stat: sm.stat_name(stat) for stat in comparison.rows}
+    width = max(map(len, names.values()), default=0)
+    lines = [f"  {'':<{width}}  " + "  ".join(f"{name:>10}" for name in comparison.names)]
+    for stat, values in comparison.rows.items():
+        mark = "*" if stat in changed else " "
+        lines.append(f"{mark} {names[stat]:<{width}}  " + "  ".join(f"{sm.display_value(stat, value):>10}" for value in values))
+    return "\n".join(lines)
@@ -0,0 +1,208 @@
+import time
+from array import array
+from collections.abc import Iterable, Sequence
+from typing import NamedTuple
+
+import abilities as ab
+from enums import Modifier
+from model import Build
+import summarize as sm
+import talents as tl
+from totals import Totals
+
+
+# Health before HEALTH; not given by the game's tables, so only comparisons
+# between builds are meaningful
+BASE_HEALTH: float = 400.0
+# Highest share of damage that protection or hardening can remove
+MAX_REDUCTION: float = 0.9
+
+
+class Armor(NamedTuple):
+    weight: str
+    shields: float
+    # Before talents. Protection reduces weapon damage, hardening tech and biotic.
+    damage_protection: float
+    hardening: float
+    protection_modifier: Modifier
+    hardening_modifier: Modifier
+    # The talent whose bonuses it takes; a class can wear it if it has this
+    # talent or a heavier armor's
+    talent: type[tl.Talent]
+
+
+# Lightest first; approximate numbers for armor of the same tier
+armors: tuple[Armor, ...] = (
+    Armor("Light", 240.0, 0.10, 0.10, Modifier.LIGHT_ARMOR_DR, Modifier.LIGHT_ARMOR_HARDENING, tl.BasicArmor),
+    Armor("Medium", 300.0, 0.20, 0.15, Modifier.MED_ARMOR_DR, Modifier.MED_ARMOR_HARDENING, tl.TacticalArmor),
+    Armor("Heavy", 360.0, 0.30, 0.20, Modifier.HEAVY_ARMOR_DR, Modifier.HEAVY_ARMOR_HARDENING, tl.CombatArmor),
+)
+damage_types: tuple[str, ...] = ("Weapon", "Tech", "Biotic")
+
+
+class Defenses(NamedTuple):
+    # Every defensive number of one build, whatever armor it wears
+    health: float
+    # Added to the armor's
+    shields: float
+    # DAMAGE_PROTECTION, against weapons
+    protection: float
+    tech_protection: float
+    biotic_protection: float
+    # Health per second
+    regen: float
+    # Talent bonuses for each of armors
+    armor_protection: tuple[float, ...]
+    armor_hardening: tuple[float, ...]
+    # Immunity's damage reduction while active, and the share of the time it is
+    immunity: float
+    immunity_uptime: float
+    # Share of shields Shield Boost restores per second, over its recharge
+    shield_boost: float
+    # Barrier's shielding per cast, and per second over its recharge
+    barrier: float
+    barrier_rate: float
+    # For each of armors, whether the build's class can wear it
+    wearable: tuple[bool, ...]
+
+
+class Table(NamedTuple):
+    # Keyed by (armor weight, damage type), one value per build, 0 where the
+    # build cannot wear the armor:
+    # damage taken to kill from full, opening with Barrier, with Immunity
+    # counted for the share of the time it is up
+    effective_health: dict[tuple[str, str], array]
+    # Share of that damage type removed over a long fight
+    mitigation: dict[tuple[str, str], array]
+    # Keyed by armor weight: health and shields restored per second
+    recovery: dict[str, array]
+    # Keyed by armor weight: 1 where the build can wear it
+    wearable: dict[str, array]
+
+
+def wearable(talents: Sequence[type[tl.Talent]]) -> tuple[Armor, ...]:
+    # The armor whose talent the class has, and anything lighter
+    heaviest = max((index for index, armor in enumerate(armors) if armor.talent in talents), default=0)
+    return armors[:heaviest + 1]
+
+
+def defenses(totals: Totals, talents: Sequence[type[tl.Talent]]) -> Defenses:
+    # talents are the build's, for the armors it can wear
+    modifiers = totals.get_modifiers()
+    immunity = sm.calculate_ability(ab.IMMUNITY, [totals])
+    shield_boost = sm.calculate_ability(ab.SHIELD_BOOST, [totals])
+    barrier = sm.calculate_ability(ab.BARRIER, [totals])
+    shielding = barrier.get("Shielding {}", 0.0) + barrier.get("Regen {} pts / sec", 0.0) * barrier.get("Duration {} sec", 0.0)
+    return Defenses(
+        BASE_HEALTH * (1.0 + modifiers.get(Modifier.HEALTH)),
+        modifiers.get(Modifier.SHIELD_CAPACITY),
+        modifiers.get(Modifier.DAMAGE_PROTECTION),
+        modifiers.get(Modifier.TECH_PROTECTION),
+        modifiers.get(Modifier.BIOTIC_PROTECTION),
+        modifiers.get(Modifier.HEALTH_REGEN),
+        tuple(modifiers.get(armor.protection_modifier) for armor in armors),
+        tuple(modifiers.get(armor.hardening_modifier) for armor in armors),
+        immunity.get("Damage Reduction {}%", 0.0),
+        min(1.0, immunity["Duration {} sec"] / immunity["Recharge {} sec"]) if immunity else 0.0,
+        shield_boost["Shields Restored {}%"] / shield_boost["Recharge {} sec"] if shield_boost else 0.0,
+        shielding,
+        shielding / barrier["Recharge {} sec"] if barrier else 0.0,
+        tuple(armor in wearable(talents) for armor in armors),
+    )
+
+
+def table_from_defenses(build_defenses: Sequence[Defenses]) -> Table:
+    # Every armor and damage type as a column over all builds. Each field is
+    # turned into one array first, so a column is a single pass of zips.
+    columns = {field: array("d", values) for field, values in zip(Defenses._fields, zip(*build_defenses))
+               if field not in ("armor_protection", "armor_hardening", "wearable")}
+    armor_protection = [array("d", values) for values in zip(*(d.armor_protection for d in build_defenses))]
+    armor_hardening = [array("d", values) for values in zip(*(d.armor_hardening for d in build_defenses))]
+    wears = [array("b", values) for values in zip(*(d.wearable for d in build_defenses))]
+    if not build_defenses:
+        armor_protection = armor_hardening = [array("d")] * len(armors)
+        wears = [array("b")] * len(armors)
+    # Immunity only covers the damage taken while it is up, so its reduction
+    # counts for its uptime rather than for the whole health pool
+    immunity_average = array("d", (1.0 - reduction * uptime for reduction, uptime in zip(columns["immunity"], columns["immunity_uptime"])))
+    effective_health: dict[tuple[str, str], array] = {}
+    mitigation: dict[tuple[str, str], array] = {}
+    recovery: dict[str, array] = {}
+    worn: dict[str, array] = {}
+    for index, armor in enumerate(armors):
+        worn[armor.weight] = wears[index]
+        # Reduction before Immunity, by damage type
+        reductions = {
+            "Weapon": array("d", (min(MAX_REDUCTION, armor.damage_protection + talent + general)
+                                  for talent, general in zip(armor_protection[index], columns["protection"]))),
+            "Tech": array("d", (min(MAX_REDUCTION, armor.hardening + talent + tech)
+                                for talent, tech in zip(armor_hardening[index], columns["tech_protection"]))),
+            "Biotic": array("d", (min(MAX_REDUCTION, armor.hardening + talent + biotic)
+                                  for talent, biotic in zip(armor_hardening[index], columns["biotic_protection"]))),
+        }
+        # Shields take damage in full; Barrier's shielding is spent first
+        shields = array("d", (armor.shields + extra + barrier for extra, barrier in zip(columns["shields"], columns["barrier"])))
+        for damage_type, reduction in reductions.items():
+            effective_health[armor.weight, damage_type] = array("d", (
+                (shield + health / ((1.0 - reduced) * average)) * can
+                for shield, health, reduced, average, can in zip(shields, columns["health"], reduction, immunity_average, wears[index])
+            ))
+            mitigation[armor.weight, damage_type] = array("d", (
+                (1.0 - (1.0 - reduced) * average) * can for reduced, average, can in zip(reduction, immunity_average, wears[index])
+            ))
+        recovery[armor.weight] = array("d", (
+            (regen + (armor.shields + extra) * boost + barrier_rate) * can
+            for regen, extra, boost, barrier_rate, can
+            in zip(columns["regen"], columns["shields"], columns["shield_boost"], columns["barrier_rate"], wears[index])
+        ))
+    return Table(effective_health, mitigation, recovery, worn)
+
+
+def table(builds: Iterable[Build]) -> Table:
+    return table_from_defenses([defenses(Totals.from_ranks(talents, ranks), talents) for talents, ranks in builds])
+
+
+def ranking(result: Table, weight: str, damage_type: str, top: int = 10) -> list[int]:
+    # Positions of the top builds by effective health in one armor against one
+    # damage type, best first; builds that cannot wear the armor are left out
+    values = result.effective_health[weight, damage_type]
+    candidates = [position for position, can in enumerate(result.wearable[weight]) if can]
+    return sorted(candidates, key=values.__getitem__, reverse=True)[:top]
+
+
+def format_defenses(build_defenses: Defenses) -> str:
+    # One build's consolidated defense, a line per armor weight
+    result = table_from_defenses([build_defenses])
+    lines = [f"Health {sm.truncate(build_defenses.health)}, Immunity {sm.truncate(build_defenses.immunity * 100)}% "
+             f"for {sm.truncate(build_defenses.immunity_uptime * 100)}% of the time"]
+    for armor in armors:
+        if not result.wearable[armor.weight][0]:
+            lines.append(f"    {armor.weight}: cannot be worn")
+            continue
+        shown = ", ".join(
+            f"{damage_type} {sm.truncate(result.effective_health[armor.weight, damage_type][0])} "
+            f"({sm.truncate(result.mitigation[armor.weight, damage_type][0] * 100)}%)"
+            for damage_type in damage_types
+        )
+        lines.append(f"    {armor.weight}: {shown}, recovers {sm.truncate(result.recovery[armor.weight][0])} per sec")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import random
+    from presets import presets
+    from tables import MAX_RANK
+
+    rng = random.Random(0)
+    talent_sets = [preset.with_specialization(spec) for preset in presets.values() for spec in preset.specializations]
+    builds = [Build(talents, tuple(rng.randint(0, MAX_RANK) for _ in talents)) for talents in talent_sets for _ in range(200)]
+    start = time.perf_counter()
+    build_defenses = [defenses(Totals.from_ranks(talents, ranks), talents) for talents, ranks in builds]
+    middle = time.perf_counter()
+    result = table_from_defenses(build_defenses)
+    end = time.perf_counter()
+    print(f"{len(builds)} builds: defenses {(middle - start) * 1000:.0f} ms, "
+          f"{len(armors)} armors x {len(damage_types)} types {(end - middle) * 1000:.0f} ms")
+    for position in ranking(result, "Heavy", "Weapon", 3):
+        print(f"{builds[position].talents[-4].__name__}")
+        print(format_defenses(build_defenses[position]))
@@ -0,0 +1,228 @@
+import time
+from array import array
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from operator import add
+from typing import NamedTuple
+
+import abilities as ab
+from codegen import stats_evaluator, StatsEvaluator
+from index import ability_keys, Key, projection
+from model import Build
+import summarize as sm
+import talents as tl
+
+
+class Enemy(NamedTuple):
+    name: str
+    health: float
+    shields: float
+    # Share of health damage ignored, before Warp and Overload reduce it
+    protection: float
+    # Synthetics take no toxic damage and cannot be knocked out; only they can be hacked
+    synthetic: bool
+    # Titles of control powers with no effect on it, e.g. too heavy to Lift
+    immune: frozenset[str] = frozenset()
+
+
+# Approximate numbers at mid difficulty; relative toughness matters more than the values
+catalog: tuple[Enemy, ...] = (
+    Enemy("Geth Trooper", 300, 150, 0.10, True),
+    Enemy("Geth Shock Trooper", 350, 250, 0.15, True),
+    Enemy("Geth Rocket Trooper", 350, 200, 0.15, True),
+    Enemy("Geth Sniper", 300, 200, 0.10, True),
+    Enemy("Geth Destroyer", 600, 400, 0.30, True),
+    Enemy("Geth Juggernaut", 800, 600, 0.35, True),
+    Enemy("Geth Prime", 1500, 1200, 0.40, True, frozenset({"Lift", "Throw", "Singularity"})),
+    Enemy("Geth Hopper", 250, 100, 0.05, True),
+    Enemy("Geth Stalker", 250, 150, 0.05, True),
+    Enemy("Geth Armature", 4000, 2000, 0.50, True, frozenset({"Lift", "Throw", "Singularity", "Stasis"})),
+    Enemy("Geth Colossus", 8000, 4000, 0.55, True, frozenset({"Lift", "Throw", "Singularity", "Stasis"})),
+    Enemy("Husk", 150, 0, 0.00, False),
+    Enemy("Krogan Battlemaster", 1200, 400, 0.40, False),
+    Enemy("Krogan Mercenary", 700, 200, 0.30, False),
+    Enemy("Turian Soldier", 400, 250, 0.20, False),
+    Enemy("Turian Commando", 500, 350, 0.25, False),
+    Enemy("Salarian Engineer", 300, 300, 0.10, False),
+    Enemy("Asari Commando", 500, 400, 0.20, False),
+    Enemy("Human Mercenary", 350, 200, 0.15, False),
+    Enemy("Rachni Worker", 200, 0, 0.05, False),
+    Enemy("Rachni Soldier", 600, 0, 0.25, False),
+    Enemy("Thorian Creeper", 250, 0, 0.05, False),
+    Enemy("Varren", 250, 0, 0.05, False),
+    Enemy("Thresher Maw", 12000, 0, 0.60, False, frozenset({"Lift", "Throw", "Singularity", "Stasis"})),
+)
+
+
+class Profile(NamedTuple):
+    # What a build does to any target when it opens with all of its powers
+    shield_damage: float
+    # Tech mine damage from Overload, Sabotage and Damping; shields take it first
+    tech_damage: float
+    # Warp and Sabotage damage over their durations; health only
+    burn_damage: float
+    # Neural Shock toxic damage; organic health only
+    toxic_damage: float
+    # Remaining share of protection while Warp and Overload last
+    protection_left: float
+    # Seconds of each of control_titles (Damping's is its stun); the same on
+    # anything not immune
+    control: tuple[float, ...]
+    # Neural Shock knockout, organics only
+    knockout: float
+    # AI Hacking, synthetics only
+    hacking: float
+
+
+class Matrix(NamedTuple):
+    enemies: tuple[Enemy, ...]
+    # One row per build, one value per enemy
+    damage: list[array]
+    control: list[array]
+
+
+_by_title: dict[str, ab.Ability] = {ability.title: ability for ability in ab.catalog}
+control_titles: tuple[str, ...] = ("Lift", "Stasis", "Singularity", "Damping", "Throw")
+_control_templates: tuple[str, ...] = ("Duration {} sec", "Stun {} sec")
+# The abilities a profile reads, and the keys their summaries depend on
+_profiled: tuple[ab.Ability, ...] = tuple(_by_title[title] for title in (
+    "Warp", "Overload", "Sabotage", "Neural Shock", "AI Hacking", *control_titles))
+_keys: frozenset[Key] = ability_keys(_profiled)
+_templates: tuple[tuple[str, ...], ...] = tuple(tuple(stat.template for stat in ability.stats) for ability in _profiled)
+
+
+def profile(values: Mapping[str, Mapping[str, float]]) -> Profile:
+    # values: title -> summarize.calculate_ability's result, for at least
+    # the profiled abilities
+    warp, overload, sabotage = values["Warp"], values["Overload"], values["Sabotage"]
+    protection_left = 1.0
+    for stats in (warp, overload):
+        protection_left *= 1.0 - stats.get("Reduce Damage Protection {}%", 0.0)
+    control = tuple(sum(values[title].get(template, 0.0) for template in _control_templates) for title in control_titles)
+    return Profile(
+        overload.get("Shield Damage {}", 0.0),
+        sum(values[title].get("Tech Mine Damage {}", 0.0) for title in ("Overload", "Sabotage", "Damping")),
+        warp.get("DPS {}", 0.0) * warp.get("Duration {} sec", 0.0)
+        + sabotage.get("Burn DPS {}", 0.0) * sabotage.get("Duration {} sec", 0.0),
+        values["Neural Shock"].get("Toxic Damage {}", 0.0),
+        protection_left,
+        control,
+        values["Neural Shock"].get("Knockout {} sec", 0.0),
+        values["AI Hacking"].get("Duration {} sec", 0.0),
+    )
+
+
+def profiles(builds: Iterable[Build]) -> list[Profile]:
+    # One per build. Builds are first reduced to the ranks of the talents that
+    # feed the profiled abilities, and each distinct reduction is profiled
+    # once, with a generated function for just those abilities.
+    evaluators: dict[tuple[type[tl.Talent], ...], tuple[Callable[[Sequence[int]], tuple[int, ...]], StatsEvaluator]] = {}
+    found: dict[tuple, Profile] = {}
+    result = []
+    for talents, ranks in builds:
+        pair = evaluators.get(talents)
+        if pair is None:
+            pair = evaluators[talents] = (projection(talents, _keys), stats_evaluator(talents, _profiled))
+        project, evaluate = pair
+        key = (talents, project(ranks))
+        built = found.get(key)
+        if built is None:
+            built = found[key] = profile({
+                ability.title: dict(zip(templates, stats)) for ability, templates, stats in zip(_profiled, _templates, evaluate(ranks))
+            })
+        result.append(built)
+    return result
+
+
+class _Columns(NamedTuple):
+    # Distinct profiles as one array per field, for the passes over every enemy
+    shield_damage: array
+    tech_damage: array
+    burn_damage: array
+    toxic_damage: array
+    protection_left: array
+    # One per control title
+    control: tuple[array, ...]
+    knockout: array
+    hacking: array
+
+
+def _columns(profiles: Sequence[Profile]) -> _Columns:
+    fields = list(zip(*profiles)) or [()] * len(Profile._fields)
+    controls = list(zip(*fields[5])) or [()] * len(control_titles)
+    return _Columns(
+        *(array("d", values) for values in fields[:5]),
+        tuple(array("d", values) for values in controls),
+        array("d", fields[6]), array("d", fields[7]),
+    )
+
+
+def _damage_column(columns: _Columns, enemy: Enemy) -> array:
+    # Shields soak Overload and tech damage; what gets through, burn and toxic
+    # damage then hit health through the protection Warp and Overload leave.
+    # Capped at what the enemy has. Conditional expressions rather than
+    # min/max, which cost more than the arithmetic.
+    shields, health, protection = enemy.shields, enemy.health, enemy.protection
+    toxic = 0.0 if enemy.synthetic else 1.0
+    result = array("d")
+    for shield_damage, tech_damage, burn_damage, toxic_damage, protection_left in zip(
+            columns.shield_damage, columns.tech_damage, columns.burn_damage, columns.toxic_damage, columns.protection_left):
+        soaked = shield_damage + tech_damage
+        # Shields left after Overload, then the tech damage that gets past them
+        left = shields - shield_damage
+        through = tech_damage - left if left > 0.0 else tech_damage
+        hit = ((through if through > 0.0 else 0.0) + burn_damage + toxic * toxic_damage) * (1.0 - protection * protection_left)
+        result.append((soaked if soaked < shields else shields) + (hit if hit < health else health))
+    return result
+
+
+def _control_column(columns: _Columns, enemy: Enemy) -> array:
+    applied = [seconds for title, seconds in zip(control_titles, columns.control) if title not in enemy.immune]
+    applied.append(columns.hacking if enemy.synthetic else columns.knockout)
+    total = applied[0]
+    for seconds in applied[1:]:
+        total = map(add, total, seconds)
+    return array("d", total)
+
+
+def matrix(builds: Iterable[Build], enemies: Sequence[Enemy] = catalog) -> Matrix:
+    # Effective damage and control seconds of each build's opening against
+    # each enemy. Builds are reduced to profiles once; every enemy is then a
+    # column over all profiles, transposed into rows at the end.
+    return matrix_from_profiles(profiles(builds), enemies)
+
+
+def matrix_from_profiles(profiles: Sequence[Profile], enemies: Sequence[Enemy] = catalog) -> Matrix:
+    # Builds with the same profile (often every build without the powers
+    # involved) are only computed once
+    unique: dict[Profile, int] = {}
+    positions = [unique.setdefault(p, len(unique)) for p in profiles]
+    columns = _columns(list(unique))
+    damage = [array("d", row) for row in zip(*(_damage_column(columns, enemy) for enemy in enemies))]
+    # Control only depends on the enemy's immunities and whether it is synthetic
+    by_kind: dict[tuple[frozenset[str], bool], array] = {}
+    for enemy in enemies:
+        if (enemy.immune, enemy.synthetic) not in by_kind:
+            by_kind[enemy.immune, enemy.synthetic] = _control_column(columns, enemy)
+    control = [array("d", row) for row in zip(*(by_kind[enemy.immune, enemy.synthetic] for enemy in enemies))]
+    return Matrix(tuple(enemies), [damage[position] for position in positions], [control[position] for position in positions])
+
+
+if __name__ == "__main__":
+    import random
+    from presets import presets
+    from tables import MAX_RANK
+
+    rng = random.Random(0)
+    talent_sets = [preset.with_specialization(spec) for preset in presets.values() for spec in preset.specializations]
+    builds = [Build(talents, tuple(rng.randint(0, MAX_RANK) for _ in talents)) for talents in talent_sets for _ in range(200)]
+    start = time.perf_counter()
+    build_profiles = profiles(builds)
+    middle = time.perf_counter()
+    result = matrix_from_profiles(build_profiles)
+    end = time.perf_counter()
+    print(f"{len(builds)} builds: profiles {(middle - start) * 1000:.0f} ms, "
+          f"{len(builds)} x {len(catalog)} matrix {(end - middle) * 1000:.0f} ms, {len(set(build_profiles))} distinct")
+    # The first Sentinel Bastion build, which has tech and biotic powers
+    row = next(index for index, build in enumerate(builds) if build.talents[-4].__name__ == "SentinelBastion")
+    for enemy, damage, control in zip(catalog, result.damage[row], result.control[row]):
+        print(f"    {enemy.name:<22} damage {sm.truncate(damage):>8}  control {sm.truncate(control)} sec")
@@ -0,0 +1,71 @@
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+
+class Budget(NamedTuple):
+    module: str
+    # Cumulative import time allowed, in milliseconds
+    limit_ms: float
+    # Modules that must not be imported along with it
+    forbidden: tuple[str, ...] = ()
+    gui: bool = False
+
+
+# Entry points: the window (test.py) and the command line tools. What the first
+# paint does not need is imported on first use, so it is forbidden here.
+budgets: tuple[Budget, ...] = (
+    Budget("test", 600.0, ("compare", "traces", "PyQt5.uic"), gui=True),
+    Budget("batch", 80.0, ("PyQt5", "widgets")),
+    Budget("asyncbatch", 120.0, ("PyQt5", "widgets")),
+    Budget("server", 120.0, ("PyQt5", "widgets")),
+    Budget("sweep", 100.0, ("PyQt5", "widgets", "index")),
+)
+
+
+def measure(module: str) -> tuple[float, dict[str, float]] | None:
+    # (cumulative ms for module, ms by every module it imported); None if it
+    # failed to import. -X importtime reports microseconds on stderr.
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=Path(__file__).parent, capture_output=True, text=True,
+        env={**os.environ, "QT_QPA_PLATFORM": os.environ.get("QT_QPA_PLATFORM", "offscreen")},
+    )
+    if result.returncode:
+        return None
+    imported: dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            imported[fields[2].strip()] = int(fields[1]) / 1000
+    return imported[module], imported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check import times against their budgets")
+    parser.add_argument("--runs", type=int, default=5, help="the fastest run counts")
+    arguments = parser.parse_args()
+    failed = False
+    for budget in budgets:
+        # The first run also warms the bytecode, table and UI caches
+        runs = [measure(budget.module) for _ in range(arguments.runs + 1)][1:]
+        if None in runs:
+            reason = "needs PyQt5" if budget.gui else "fails to import"
+            failed |= not budget.gui
+            print(f"{budget.module:<12} skipped, {reason}")
+            continue
+        total, imported = min(runs)
+        loaded = [name for name in budget.forbidden if name in imported]
+        over = total > budget.limit_ms or loaded
+        failed |= bool(over)
+        print(f"{budget.module:<12} {total:7.1f} ms of {budget.limit_ms:.0f}  {'OVER' if over else 'ok'}")
+        if loaded:
+            print(f"    imports {', '.join(loaded)}")
+        if over:
+            heaviest = sorted(imported.items(), key=lambda item: item[1], reverse=True)[1:6]
+            for name, ms in heaviest:
+                print(f"    {name:<32} {ms:7.1f} ms")
+    sys.exit(failed)
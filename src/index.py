@@ -0,0 +1,83 @@
+import bisect
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Sequence
+
+import abilities as ab
+from enums import AbilityLevel, BaseValue, Modifier, Specialization
+import summarize as sm
+from tables import MAX_RANK
+import talents as tl
+
+
+Key = Modifier | BaseValue | AbilityLevel | Specialization
+Summarizer = Callable[[Iterable[tl.Talent]], str]
+
+
+def talent_classes() -> list[type[tl.Talent]]:
+    # Every talent defined in talents.py, including specializations
+    found: list[type[tl.Talent]] = []
+    pending = [tl.Talent]
+    while pending:
+        for subclass in pending.pop().__subclasses__():
+            if subclass.__module__ == tl.__name__ and subclass not in found:
+                found.append(subclass)
+                pending.append(subclass)
+    return found
+
+
+# Key -> talent -> ranks at which the talent's value for the key changes
+talent_index: dict[Key, dict[type[tl.Talent], tuple[int, ...]]] = defaultdict(dict)
+for _talent in talent_classes():
+    for _key, _lookup in (*_talent.modifier_table.items(), *_talent.ability_table.items()):
+        talent_index[_key][_talent] = tuple(sorted(_lookup))
+talent_index = dict(talent_index)
+
+# Key -> summarizers that read it
+summarizer_index: dict[Key, tuple[Summarizer, ...]] = {
+    key: tuple(summarizer for summarizer in sm.summarizers if key in sm.get_dependencies(summarizer))
+    for key in (*Modifier, *BaseValue, *AbilityLevel, *Specialization)
+}
+
+# Talent -> positions in summarize.summarizers whose output a rank change can alter
+invalidated: dict[type[tl.Talent], tuple[int, ...]] = {
+    _talent: tuple(
+        position for position, summarizer in enumerate(sm.summarizers)
+        if sm.get_dependencies(summarizer) & (_talent.modifier_table.keys() | _talent.ability_table.keys())
+    )
+    for _talent in talent_classes()
+}
+
+# Summary title -> talents that can change it
+title_index: dict[str, frozenset[type[tl.Talent]]] = {
+    sm.get_title(summarizer): frozenset(
+        talent for key in sm.get_dependencies(summarizer) for talent in talent_index.get(key, ())
+    )
+    for summarizer in sm.summarizers
+}
+del _talent, _key, _lookup
+
+
+def contributors(key: Key) -> dict[type[tl.Talent], tuple[int, ...]]:
+    return talent_index.get(key, {})
+
+
+def ability_keys(abilities: Iterable[ab.Ability]) -> frozenset[Key]:
+    # Every key the summaries of abilities read
+    wanted = set(abilities)
+    return frozenset(key for summarizer in sm.summarizers if summarizer.ability in wanted for key in sm.get_dependencies(summarizer))
+
+
+def projection(talents: Sequence[type[tl.Talent]], keys: Iterable[Key]) -> Callable[[Sequence[int]], tuple[int, ...]]:
+    # Ranks -> a tuple that is the same for two builds of talents exactly when
+    # every talent gives them the same values for keys
+    keys = frozenset(keys)
+    steps: list[tuple[int, tuple[int, ...]]] = []
+    for position, talent in enumerate(talents):
+        thresholds = sorted({rank for table in (talent.modifier_table, talent.ability_table)
+                             for key, lookup in table.items() if key in keys for rank in lookup})
+        if thresholds:
+            steps.append((position, tuple(bisect.bisect_right(thresholds, rank) for rank in range(MAX_RANK + 1))))
+
+    def project(ranks: Sequence[int]) -> tuple[int, ...]:
+        return tuple(step[ranks[position]] for position, step in steps)
+    return project
@@ -0,0 +1,287 @@
+import argparse
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import Executor
+from typing import NamedTuple
+
+from defense import Armor, MAX_REDUCTION, wearable
+from enums import Modifier
+from model import lvl_to_pts, MAX_LEVEL, MAX_RANK
+from presets import resolve
+import talents as tl
+from totals import contribution
+from vectors import positions
+
+
+# Sustained DPS of each family's weapons before talent bonuses; about the
+# tier X average of weapons.catalog
+base_dps: dict[str, float] = {
+    "Pistol": 115.0,
+    "Assault Rifles": 145.0,
+    "Shotgun": 170.0,
+    "Sniper Rifles": 115.0,
+}
+family_damage: dict[str, Modifier] = {
+    "Pistol": Modifier.PISTOL_DAMAGE,
+    "Assault Rifles": Modifier.ASSAULT_RIFLE_DAMAGE,
+    "Shotgun": Modifier.SHOTGUN_DAMAGE,
+    "Sniper Rifles": Modifier.SNIPER_RIFLE_DAMAGE,
+}
+# A class can use the families it has the weapon talent for
+family_talents: dict[str, type[tl.Talent]] = {
+    "Pistol": tl.Pistols,
+    "Assault Rifles": tl.AssaultRifles,
+    "Shotgun": tl.Shotguns,
+    "Sniper Rifles": tl.SniperRifles,
+}
+
+
+# Summed talent bonuses that a loadout's objective reads:
+# (family and all damage, armor protection, armor hardening, health)
+Terms = tuple[float, float, float, float]
+# (DPS, effective health) -> score; must not decrease as either grows, or the
+# bounds used for pruning are wrong
+Objective = Callable[[float, float], float]
+
+
+def default_objective(dps: float, effective_health: float) -> float:
+    return dps * effective_health
+
+
+class Loadout(NamedTuple):
+    score: float
+    family: str
+    armor: str
+    # In the order of the class's talents
+    ranks: tuple[int, ...]
+    dps: float
+    effective_health: float
+
+
+class Outcome(NamedTuple):
+    best: Loadout | None
+    # Families never searched, as no allocation could beat a loadout already found
+    skipped: tuple[str, ...]
+    # Partial allocations visited
+    nodes: int
+
+
+def usable(talents: Sequence[type[tl.Talent]]) -> tuple[str, ...]:
+    return tuple(family for family, talent in family_talents.items() if talent in talents)
+
+
+def rate(family: str, armor: Armor, terms: Terms) -> tuple[float, float]:
+    # (DPS, effective health). Half of incoming damage is taken as weapon
+    # damage, reduced by protection, and half as tech and biotic, by hardening.
+    damage, protection, hardening, health = terms
+    dps = base_dps[family] * (1.0 + damage)
+    taken = 0.5 * (1.0 - min(MAX_REDUCTION, armor.damage_protection + protection)) \
+        + 0.5 * (1.0 - min(MAX_REDUCTION, armor.hardening + hardening))
+    return dps, (1.0 + health) / taken
+
+
+class _Space:
+
+    # The talents that feed one (family, armor) pair, each with the lowest rank
+    # of every distinct Terms it can give. Other talents stay at 0.
+    def __init__(self, talents: Sequence[type[tl.Talent]], level: int, family: str, armor: Armor):
+        self.size = len(talents)
+        self.cap: int = min(MAX_RANK, level + 1)
+        self.points: int = lvl_to_pts[level]
+        keys = [
+            (positions[family_damage[family]], positions[Modifier.ALL_DAMAGE]),
+            (positions[armor.protection_modifier], ),
+            (positions[armor.hardening_modifier], ),
+            (positions[Modifier.HEALTH], ),
+        ]
+        # (talent index, [(rank, terms), ...] from rank 0 up)
+        self.steps: list[tuple[int, list[tuple[int, Terms]]]] = []
+        for index, talent in enumerate(talents):
+            steps: list[tuple[int, Terms]] = []
+            for rank in range(self.cap + 1):
+                values = contribution(talent, rank)[0].values
+                terms = tuple(sum(values[position] for position in group) for group in keys)
+                if not steps or terms != steps[-1][1]:
+                    steps.append((rank, terms))
+            if len(steps) > 1:
+                self.steps.append((index, steps))
+        # The most each talent adds first, so good loadouts are found early
+        self.steps.sort(key=lambda item: sum(item[1][-1][1]), reverse=True)
+        # remaining[i]: the most talents i onwards could add with no point limit
+        self.remaining: list[Terms] = [(0.0, 0.0, 0.0, 0.0)]
+        for _, steps in reversed(self.steps):
+            self.remaining.insert(0, _plus(self.remaining[0], steps[-1][1]))
+
+
+def _plus(a: Terms, b: Terms) -> Terms:
+    return (a[0] + b[0], a[1] + b[1], a[2] + b[2], a[3] + b[3])
+
+
+def _minus(a: Terms, b: Terms) -> Terms:
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2], a[3] - b[3])
+
+
+def _search_pair(space: _Space, family: str, armor: Armor, objective: Objective,
+                 incumbent: float) -> tuple[Loadout | None, int]:
+    # Depth first over the talents' steps, highest rank first, dropping a
+    # branch when even its unlimited bound cannot beat the best so far.
+    # Returns the best loadout scoring above incumbent, if any.
+    best: Loadout | None = None
+    ranks = [0] * space.size
+    nodes = 0
+
+    def score(terms: Terms) -> float:
+        return objective(*rate(family, armor, terms))
+
+    def visit(depth: int, points: int, terms: Terms):
+        nonlocal best, incumbent, nodes
+        nodes += 1
+        if depth == len(space.steps):
+            value = score(terms)
+            if value > incumbent:
+                incumbent = value
+                best = Loadout(value, family, armor.weight, tuple(ranks), *rate(family, armor, terms))
+            return
+        if score(_plus(terms, space.remaining[depth])) <= incumbent:
+            return
+        index, steps = space.steps[depth]
+        for rank, step in reversed(steps):
+            if rank <= points:
+                ranks[index] = rank
+                visit(depth + 1, points - rank, _plus(terms, step))
+        ranks[index] = 0
+
+    visit(0, space.points, (0.0, 0.0, 0.0, 0.0))
+    return best, nodes
+
+
+def _greedy(space: _Space, family: str, armor: Armor, objective: Objective) -> Loadout:
+    # A quick loadout to prune with: repeatedly take the next step with the
+    # best gain per point while points last
+    ranks = [0] * space.size
+    at = [0] * len(space.steps)
+    terms: Terms = (0.0, 0.0, 0.0, 0.0)
+    points = space.points
+    current = objective(*rate(family, armor, terms))
+    while True:
+        choice = None
+        for position, (index, steps) in enumerate(space.steps):
+            if at[position] + 1 < len(steps):
+                rank, step = steps[at[position] + 1]
+                cost = rank - ranks[index]
+                if cost > points:
+                    continue
+                gain = (objective(*rate(family, armor, _plus(terms, _minus(step, steps[at[position]][1])))) - current) / cost
+                if choice is None or gain > choice[0]:
+                    choice = (gain, position)
+        if choice is None:
+            break
+        position = choice[1]
+        index, steps = space.steps[position]
+        at[position] += 1
+        rank, step = steps[at[position]]
+        points -= rank - ranks[index]
+        terms = _plus(terms, _minus(step, steps[at[position] - 1][1]))
+        ranks[index] = rank
+        current = objective(*rate(family, armor, terms))
+    return Loadout(current, family, armor.weight, tuple(ranks), *rate(family, armor, terms))
+
+
+def _bound(space: _Space, family: str, armor: Armor, objective: Objective) -> float:
+    return objective(*rate(family, armor, space.remaining[0]))
+
+
+def _search_family(class_name: str, specialization: str | None, level: int, family: str,
+                   objective: Objective, incumbent: float) -> tuple[Loadout | None, int]:
+    # Every armor the class can wear with one family, heaviest bound first.
+    # Takes names rather than talents so it can run in another process.
+    preset, spec = resolve(class_name, specialization)
+    talents = preset.with_specialization(spec)
+    pairs = [(armor, _Space(talents, level, family, armor)) for armor in wearable(talents)]
+    pairs.sort(key=lambda pair: _bound(pair[1], family, pair[0], objective), reverse=True)
+    best: Loadout | None = None
+    nodes = 0
+    for armor, space in pairs:
+        found, visited = _search_pair(space, family, armor, objective, incumbent)
+        nodes += visited
+        if found is not None:
+            best, incumbent = found, found.score
+    return best, nodes
+
+
+def search(class_name: str, specialization: str | None = None, level: int = MAX_LEVEL,
+           objective: Objective = default_objective, executor: Executor | None = None) -> Outcome:
+    # The ranks, weapon family and armor weight that maximize objective. A
+    # greedy loadout per family sets the bar first; a family whose unlimited
+    # bound cannot clear it is skipped whole. With executor the remaining
+    # families are searched in parallel, each against that bar; objective then
+    # has to be picklable for a process pool.
+    if not 1 <= level <= MAX_LEVEL:
+        raise ValueError(f"Level {level} outside of 1-{MAX_LEVEL}")
+    preset, spec = resolve(class_name, specialization)
+    talents = preset.with_specialization(spec)
+    bounds: dict[str, float] = {}
+    best: Loadout | None = None
+    for family in usable(talents):
+        for armor in wearable(talents):
+            space = _Space(talents, level, family, armor)
+            bounds[family] = max(bounds.get(family, 0.0), _bound(space, family, armor, objective))
+            guess = _greedy(space, family, armor, objective)
+            if best is None or guess.score > best.score:
+                best = guess
+    bar = best.score
+    families = sorted((family for family in bounds if bounds[family] > bar), key=bounds.get, reverse=True)
+    skipped = tuple(family for family in bounds if family not in families)
+    nodes = 0
+    arguments = [(preset.name, spec.__name__, level, family, objective) for family in families]
+    if executor is None:
+        # In turn, each family against the best so far, so later ones may be skipped too
+        for family in families:
+            if bounds[family] <= bar:
+                skipped += (family, )
+                continue
+            found, visited = _search_family(preset.name, spec.__name__, level, family, objective, bar)
+            nodes += visited
+            if found is not None:
+                best, bar = found, found.score
+        return Outcome(best, skipped, nodes)
+    futures = [executor.submit(_search_family, *args, bar) for args in arguments]
+    for future in futures:
+        found, visited = future.result()
+        nodes += visited
+        if found is not None and found.score > best.score:
+            best = found
+    return Outcome(best, skipped, nodes)
+
+
+def format_loadout(loadout: Loadout, talents: Sequence[type[tl.Talent]]) -> str:
+    lines = [f"{loadout.family}, {loadout.armor} armor: score {loadout.score:.1f}, "
+             f"{loadout.dps:.1f} DPS, effective health x{loadout.effective_health:.2f}"]
+    for talent, rank in zip(talents, loadout.ranks):
+        if rank:
+            lines.append(f"    {talent.name}: {rank}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    from concurrent.futures import ProcessPoolExecutor
+
+    parser = argparse.ArgumentParser(description="Find the best talents, weapon family and armor weight")
+    parser.add_argument("class_name", nargs="?", help="every class when left out")
+    parser.add_argument("--specialization")
+    parser.add_argument("--level", type=int, default=MAX_LEVEL)
+    parser.add_argument("--workers", type=int, default=0, help="processes, one family each; 0 searches in turn")
+    arguments = parser.parse_args()
+    from presets import presets
+    names = [arguments.class_name] if arguments.class_name else list(presets)
+    pool = ProcessPoolExecutor(arguments.workers) if arguments.workers else None
+    for name in names:
+        start = time.perf_counter()
+        outcome = search(name, arguments.specialization, arguments.level, executor=pool)
+        elapsed = time.perf_counter() - start
+        preset, spec = resolve(name, arguments.specialization)
+        print(f"{preset.name} ({spec.name}), level {arguments.level}: {outcome.nodes} nodes in {elapsed * 1000:.0f} ms"
+              + (f", skipped {', '.join(outcome.skipped)}" if outcome.skipped else ""))
+        print(format_loadout(outcome.best, preset.with_specialization(spec)))
+    if pool:
+        pool.shutdown()
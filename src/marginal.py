@@ -0,0 +1,96 @@
+from collections.abc import Callable, Iterable
+from typing import NamedTuple
+
+from index import invalidated
+from model import MAX_LEVEL, TreeModel, lvl_to_pts
+import summarize as sm
+import talents as tl
+from totals import Totals
+
+
+Summarizer = Callable[[Iterable[tl.Talent]], str]
+
+
+class Marginal(NamedTuple):
+    index: int
+    talent: type[tl.Talent]
+    step: int
+    # Rank after the step
+    rank: int
+    # Stat -> (current value, value after the step), unrounded; stats of
+    # locked abilities count as 0
+    changes: dict[sm.StatKey, tuple[float, float]]
+
+
+class LevelUp(NamedTuple):
+    level: int
+    points: int
+    # (talent index, rank) of ability and specialization unlocks that become reachable
+    unlocks: list[tuple[int, int]]
+
+
+def analyze(model: TreeModel) -> list[Marginal]:
+    # Every legal +1/-1 step, evaluated together: the build is aggregated and
+    # summarized once, and each step only swaps one talent into the aggregate
+    # and recalculates the abilities whose summaries read that talent's tables.
+    totals = Totals(model.build())
+    base = {summarizer: sm.ability_stats(summarizer.ability, [totals]) for summarizer in sm.summarizers}
+    marginals: list[Marginal] = []
+    for index, (talent, rank) in enumerate(zip(model.talents, model.ranks)):
+        for step in (1, -1):
+            new_rank = rank + step
+            if not 0 <= new_rank <= model.max_rank(index):
+                continue
+            neighbour = totals.replace(index, talent(new_rank))
+            changes: dict[sm.StatKey, tuple[float, float]] = {}
+            for position in invalidated[talent]:
+                summarizer = sm.summarizers[position]
+                before = base[summarizer]
+                after = sm.ability_stats(summarizer.ability, [neighbour])
+                for stat in before.keys() | after.keys():
+                    old, new = before.get(stat, 0.0), after.get(stat, 0.0)
+                    if old != new:
+                        changes[stat] = (old, new)
+            marginals.append(Marginal(index, talent, step, new_rank, changes))
+    return marginals
+
+
+def level_up(model: TreeModel) -> LevelUp | None:
+    if model.level == MAX_LEVEL:
+        return None
+    level = model.level + 1
+    unlocks: list[tuple[int, int]] = []
+    for index, talent in enumerate(model.talents):
+        old_max, new_max = model.max_rank(index), model.max_rank(index, level)
+        unlocks.extend((index, rank) for rank in sorted(talent.unlock_ranks()) if old_max < rank <= new_max)
+    return LevelUp(level, lvl_to_pts[level] - model.total_points, unlocks)
+
+
+def score(marginal: Marginal) -> float:
+    # Sum of relative changes, signed so that improvements are positive.
+    # A stat appearing or disappearing counts as a whole point either way.
+    total = 0.0
+    for stat, (old, new) in marginal.changes.items():
+        if old == 0 or new == 0:
+            total += 1.0 if new else -1.0
+            continue
+        change = (new - old) / max(abs(old), abs(new))
+        if sm.is_lower_better(stat):
+            change = -change
+        total += change
+    return total
+
+
+def recommend(model: TreeModel) -> Marginal | None:
+    candidates = [marginal for marginal in analyze(model) if marginal.step == 1]
+    return max(candidates, key=score, default=None)
+
+
+def format_table(marginals: Iterable[Marginal]) -> str:
+    lines = []
+    for marginal in marginals:
+        sign = "+" if marginal.step > 0 else "-"
+        lines.append(f"{marginal.talent.name} {sign}1 (rank {marginal.rank})")
+        for stat, (old, new) in sorted(marginal.changes.items()):
+            lines.append(f"    {sm.stat_name(stat)}: {sm.display_value(stat, old)} -> {sm.display_value(stat, new)}")
+    return "\n".join(lines)
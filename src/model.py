@@ -0,0 +1,153 @@
+import bisect
+import itertools
+from collections.abc import Callable, Iterable
+from enum import auto, Enum
+from typing import NamedTuple
+
+import talents as tl
+
+
+MAX_LEVEL: int = 60
+MAX_RANK: int = 12
+
+# 1-5: 3 points per level
+# 6-35: 2 points per level
+# 36-60: 1 point per level
+point_totals: list[int] = list(itertools.accumulate([3]*5 + [2]*30 + [1]*25))
+lvl_to_pts: dict[int, int] = dict(enumerate(point_totals, start=1))
+pts_to_lvl: dict[int, int] = {pts: lvl for lvl, pts in lvl_to_pts.items()}
+
+# Lowest level with at least as many total points as the index
+min_lvl_for_pts: list[int] = [bisect.bisect_left(point_totals, pts) + 1 for pts in range(point_totals[-1] + 1)]
+
+
+class Build(NamedTuple):
+    talents: tuple[type[tl.Talent], ...]
+    ranks: tuple[int, ...]
+
+
+class ModelEvent(Enum):
+    LEVEL   = auto()
+    RANK    = auto()
+    PRESET  = auto()
+
+
+# Called with the event and, for RANK events, the index of the changed talent
+Listener = Callable[[ModelEvent, int | None], None]
+
+
+class TreeModel:
+
+    def __init__(self, level: int = 1):
+        self._level: int = level
+        self._talents: tuple[type[tl.Talent], ...] = ()
+        self._ranks: list[int] = []
+        self._allocated: int = 0
+        # Number of talents at each rank, so the highest rank is tracked without a scan
+        self._rank_counts: list[int] = [0] * (MAX_RANK + 1)
+        self._highest_rank: int = 0
+        self._listeners: list[Listener] = []
+
+    def subscribe(self, listener: Listener):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener):
+        self._listeners.remove(listener)
+
+    def _emit(self, event: ModelEvent, index: int | None = None):
+        for listener in self._listeners:
+            listener(event, index)
+
+    @property
+    def level(self) -> int:
+        return self._level
+
+    @property
+    def talents(self) -> tuple[type[tl.Talent], ...]:
+        return self._talents
+
+    @property
+    def ranks(self) -> tuple[int, ...]:
+        return tuple(self._ranks)
+
+    @property
+    def total_points(self) -> int:
+        return lvl_to_pts[self._level]
+
+    @property
+    def allocated_points(self) -> int:
+        return self._allocated
+
+    @property
+    def unallocated_points(self) -> int:
+        return self.total_points - self._allocated
+
+    @property
+    def highest_rank(self) -> int:
+        return self._highest_rank
+
+    @property
+    def min_level(self) -> int:
+        # 1) Make sure there's at least as many total points as allocated
+        min_lvl_by_total = min_lvl_for_pts[self._allocated]
+        # 2) Make sure ranks are not greater than level + 1
+        min_lvl_by_rank = self._highest_rank - 1
+        return max((1, min_lvl_by_total, min_lvl_by_rank))
+
+    def max_rank(self, index: int, level: int | None = None) -> int:
+        # Lowest of: 12, level + 1, talent rank + remaining points
+        level = self._level if level is None else level
+        unallocated = lvl_to_pts[level] - self._allocated
+        return min((MAX_RANK, level + 1, self._ranks[index] + unallocated))
+
+    def set_level(self, level: int):
+        if level == self._level:
+            return
+        if not self.min_level <= level <= MAX_LEVEL:
+            raise ValueError(f"Level {level} outside of {self.min_level}-{MAX_LEVEL}")
+        self._level = level
+        self._emit(ModelEvent.LEVEL)
+
+    def set_rank(self, index: int, rank: int):
+        old_rank = self._ranks[index]
+        if rank == old_rank:
+            return
+        if not 0 <= rank <= self.max_rank(index):
+            raise ValueError(f"Rank {rank} outside of 0-{self.max_rank(index)} for {self._talents[index].__name__}")
+        self._move_rank(old_rank, rank)
+        self._ranks[index] = rank
+        self._emit(ModelEvent.RANK, index)
+
+    def _move_rank(self, old_rank: int, rank: int):
+        self._allocated += rank - old_rank
+        self._rank_counts[old_rank] -= 1
+        self._rank_counts[rank] += 1
+        if rank > self._highest_rank:
+            self._highest_rank = rank
+        while self._highest_rank and not self._rank_counts[self._highest_rank]:
+            self._highest_rank -= 1
+
+    def set_preset(self, talents: Iterable[type[tl.Talent]], ranks: Iterable[int] | None = None, level: int = 1):
+        talents = tuple(talents)
+        ranks = [0] * len(talents) if ranks is None else list(ranks)
+        if len(ranks) != len(talents):
+            raise ValueError(f"Expected {len(talents)} ranks, got {len(ranks)}")
+        if not all(0 <= rank <= MAX_RANK for rank in ranks):
+            raise ValueError(f"Ranks must be within 0-{MAX_RANK}")
+        if sum(ranks) > point_totals[-1]:
+            raise ValueError(f"{sum(ranks)} points allocated, at most {point_totals[-1]} available")
+        self._talents = talents
+        self._ranks = ranks
+        self._allocated = sum(ranks)
+        self._rank_counts = [0] * (MAX_RANK + 1)
+        for rank in ranks:
+            self._rank_counts[rank] += 1
+        self._highest_rank = max(ranks, default=0)
+        self._level = min(max(level, self.min_level), MAX_LEVEL)
+        self._emit(ModelEvent.PRESET)
+
+    def snapshot(self) -> Build:
+        return Build(self._talents, tuple(self._ranks))
+
+    def build(self) -> list[tl.Talent]:
+        return [talent(rank) for talent, rank in zip(self._talents, self._ranks)]
@@ -0,0 +1,151 @@
+from typing import NamedTuple
+
+import talents as tl
+
+
+class Preset(NamedTuple):
+    name: str
+    talents: tuple[type[tl.Talent], ...]
+    # Choices for the class talent; the first is the unspecialized class talent
+    specializations: tuple[type[tl.Talent], ...]
+
+    def with_specialization(self, spec: type[tl.Talent]) -> tuple[type[tl.Talent], ...]:
+        base = self.specializations[0]
+        return tuple(spec if talent is base else talent for talent in self.talents)
+
+
+SOLDIER = Preset(
+    "Soldier",
+    (
+        tl.Pistols,
+        tl.AssaultRifles,
+        tl.Shotguns,
+        tl.SniperRifles,
+        tl.AssaultTraining,
+        tl.Fitness,
+        tl.CombatArmor,
+        tl.FirstAid,
+        tl.Soldier,
+        tl.SpectreTraining,
+        tl.Charm,
+        tl.Intimidate,
+    ),
+    (tl.Soldier, tl.SoldierCommando, tl.SoldierShockTrooper),
+)
+
+ENGINEER = Preset(
+    "Engineer",
+    (
+        tl.Pistols,
+        tl.BasicArmor,
+        tl.Decryption,
+        tl.Electronics,
+        tl.Hacking,
+        tl.Damping,
+        tl.FirstAid,
+        tl.Medicine,
+        tl.Engineer,
+        tl.SpectreTraining,
+        tl.Charm,
+        tl.Intimidate,
+    ),
+    (tl.Engineer, tl.EngineerMedic, tl.EngineerOperative),
+)
+
+ADEPT = Preset(
+    "Adept",
+    (
+        tl.Pistols,
+        tl.BasicArmor,
+        tl.Throw,
+        tl.Lift,
+        tl.Warp,
+        tl.Singularity,
+        tl.Barrier,
+        tl.Stasis,
+        tl.Adept,
+        tl.SpectreTraining,
+        tl.Charm,
+        tl.Intimidate,
+    ),
+    (tl.Adept, tl.AdeptBastion, tl.AdeptNemesis),
+)
+
+INFILTRATOR = Preset(
+    "Infiltrator",
+    (
+        tl.Pistols,
+        tl.SniperRifles,
+        tl.TacticalArmor,
+        tl.Fitness,
+        tl.Decryption,
+        tl.Electronics,
+        tl.Damping,
+        tl.FirstAid,
+        tl.Infiltrator,
+        tl.SpectreTraining,
+        tl.Charm,
+        tl.Intimidate,
+    ),
+    (tl.Infiltrator, tl.InfiltratorCommando, tl.InfiltratorOperative),
+)
+
+VANGUARD = Preset(
+    "Vanguard",
+    (
+        tl.Pistols,
+        tl.Shotguns,
+        tl.TacticalArmor,
+        tl.AssaultTraining,
+        tl.Throw,
+        tl.Lift,
+        tl.Warp,
+        tl.Barrier,
+        tl.Vanguard,
+        tl.SpectreTraining,
+        tl.Charm,
+        tl.Intimidate,
+    ),
+    (tl.Vanguard, tl.VanguardNemesis, tl.VanguardShockTrooper),
+)
+
+SENTINEL = Preset(
+    "Sentinel",
+    (
+        tl.Pistols,
+        tl.Throw,
+        tl.Lift,
+        tl.Barrier,
+        tl.Stasis,
+        tl.Decryption,
+        tl.Electronics,
+        tl.FirstAid,
+        tl.Medicine,
+        tl.Sentinel,
+        tl.SpectreTraining,
+        tl.Charm,
+        tl.Intimidate,
+    ),
+    (tl.Sentinel, tl.SentinelBastion, tl.SentinelMedic),
+)
+
+# In classCombo order
+presets: dict[str, Preset] = {
+    preset.name: preset
+    for preset in (SOLDIER, ENGINEER, ADEPT, INFILTRATOR, VANGUARD, SENTINEL)
+}
+
+
+def resolve(name: str, specialization: str | None = None) -> tuple[Preset, type[tl.Talent]]:
+    # Class by name in any case, and specialization by class name or display
+    # name, defaulting to the unspecialized class talent
+    preset = next((preset for key, preset in presets.items() if isinstance(name, str) and key.lower() == name.lower()), None)
+    if preset is None:
+        raise ValueError(f"Unknown class {name!r}, expected one of {', '.join(presets)}")
+    if specialization is None:
+        return preset, preset.specializations[0]
+    for spec in preset.specializations:
+        if specialization in (spec.__name__, spec.name):
+            return preset, spec
+    raise ValueError(f"Unknown specialization {specialization!r} for {preset.name}, expected one of "
+                     f"{', '.join(spec.__name__ for spec in preset.specializations)}")
@@ -0,0 +1,225 @@
+import heapq
+import time
+from collections.abc import Iterable
+from typing import NamedTuple
+
+import abilities as ab
+from enums import Modifier
+from model import Build
+import summarize as sm
+from totals import Totals
+import weapons
+
+
+# The accuracy pool is not given by the game's tables. Accuracy costs are
+# read as shares of an unmodified pool of 1.0, and MAX_ACCURACY and
+# ACCURACY_REGEN as fractions added to the base pool and regen, the reading
+# variants' "max-accuracy-percent" layer asks about. The base pool and the
+# base regen per second are parameters of kit for that reason.
+
+# Weapon damage per second that percentage-of-weapon powers scale, so their
+# damage reads as a percentage of the weapon's
+REFERENCE_WEAPON_DPS: float = 100.0
+
+
+class Power(NamedTuple):
+    title: str
+    # After haste, as summaries show it
+    recharge: float
+    # 0 for powers with no lasting effect
+    duration: float
+    # Share of the accuracy pool spent by casting
+    accuracy_cost: float
+    # Damage per second of its own while active (Warp, Sabotage burn)
+    dps: float
+    # Added to the damage multiplier of its weapon family while active
+    # (Marksman, Overkill, Carnage, Assassination; see weapons.family_powers)
+    weapon_bonus: float
+    # Adrenaline Burst finishes every other power's recharge
+    resets: bool = False
+
+
+class Kit(NamedTuple):
+    powers: tuple[Power, ...]
+    max_accuracy: float
+    # Per second, as a share of the pool
+    accuracy_regen: float
+
+
+class Policy(NamedTuple):
+    # Titles in the order they are cast when several are ready at once;
+    # powers not listed are never cast
+    priority: tuple[str, ...]
+    # Seconds a cast takes, during which nothing else is cast
+    cast_time: float = 1.0
+    # Weapon family fired throughout; only its power's weapon_bonus counts.
+    # None counts no weapon damage.
+    family: str | None = None
+
+
+class Report(NamedTuple):
+    seconds: float
+    casts: dict[str, int]
+    # Share of the time each power's effect was active
+    uptime: dict[str, float]
+    # Damage dealt by each power over the run
+    damage: dict[str, float]
+    dps: float
+    # Share of the time no power's effect was active
+    idle: float
+
+
+# Templates of the stats the simulation reads
+_damage_templates: tuple[str, ...] = ("DPS {}", "Burn DPS {}")
+_weapon_templates: tuple[str, ...] = ("Damage {}% DPS", "Damage + {}%")
+
+
+def kit(totals: Totals, base_regen: float, base_accuracy: float = 1.0) -> Kit:
+    # Every unlocked power with a recharge, in catalog order
+    powers = []
+    for ability in ab.catalog:
+        values = sm.calculate_ability(ability, [totals])
+        if "Recharge {} sec" not in values:
+            continue
+        powers.append(Power(
+            ability.title,
+            values["Recharge {} sec"],
+            values.get("Duration {} sec", 0.0),
+            values.get("Accuracy Cost {}%", 0.0),
+            sum(values.get(template, 0.0) for template in _damage_templates),
+            sum(values.get(template, 0.0) for template in _weapon_templates),
+            ability is ab.ADRENALINE_BURST,
+        ))
+    modifiers = totals.get_modifiers()
+    return Kit(
+        tuple(powers),
+        base_accuracy * (1.0 + modifiers.get(Modifier.MAX_ACCURACY, 0.0)),
+        base_regen * (1.0 + modifiers.get(Modifier.ACCURACY_REGEN, 0.0)),
+    )
+
+
+def _weapon_power(family: str | None) -> str | None:
+    if family is None:
+        return None
+    if family not in weapons.family_powers:
+        raise ValueError(f"Unknown weapon family {family!r}, expected one of {', '.join(weapons.families)}")
+    return weapons.family_powers[family].title
+
+
+def default_policy(kit: Kit, family: str | None = None) -> Policy:
+    # Damage first, then whatever else is ready
+    weapon_power = _weapon_power(family)
+    ordered = sorted(kit.powers, key=lambda power: not (power.dps or power.title == weapon_power and power.weapon_bonus))
+    return Policy(tuple(power.title for power in ordered), family=family)
+
+
+def _covered(intervals: list[tuple[float, float]]) -> float:
+    # Total length of the union of intervals
+    total = 0.0
+    end = 0.0
+    for start, stop in sorted(intervals):
+        if stop > end:
+            total += stop - max(start, end)
+            end = stop
+    return total
+
+
+def simulate(kit: Kit, policy: Policy, seconds: float, weapon_dps: float = REFERENCE_WEAPON_DPS) -> Report:
+    # Events are the times a power may next be castable, ordered by time and
+    # then priority. A stale event (its power was cast or reset since) is
+    # skipped by its generation; one that finds the caster busy, the power
+    # recharging or too little accuracy is pushed back to when that changes.
+    by_title = {power.title: power for power in kit.powers}
+    powers = [by_title[title] for title in policy.priority if title in by_title]
+    ready = [0.0] * len(powers)
+    generation = [0] * len(powers)
+    active: list[list[tuple[float, float]]] = [[] for _ in powers]
+    casts = [0] * len(powers)
+    events = [(0.0, rank, 0) for rank, power in enumerate(powers) if power.accuracy_cost <= kit.max_accuracy]
+    heapq.heapify(events)
+    busy = 0.0
+    accuracy, accuracy_time = kit.max_accuracy, 0.0
+
+    def schedule(at: float, rank: int):
+        generation[rank] += 1
+        heapq.heappush(events, (at, rank, generation[rank]))
+
+    while events:
+        now, rank, event_generation = heapq.heappop(events)
+        if now >= seconds:
+            break
+        if event_generation != generation[rank]:
+            continue
+        power = powers[rank]
+        if now < busy or now < ready[rank]:
+            schedule(max(busy, ready[rank]), rank)
+            continue
+        pool = min(kit.max_accuracy, accuracy + (now - accuracy_time) * kit.accuracy_regen)
+        # With a little slack, so waiting until the pool refills is enough despite rounding
+        if pool < power.accuracy_cost - 1e-9:
+            if kit.accuracy_regen <= 0:
+                continue
+            schedule(now + (power.accuracy_cost - pool) / kit.accuracy_regen, rank)
+            continue
+        accuracy, accuracy_time = max(0.0, pool - power.accuracy_cost), now
+        casts[rank] += 1
+        busy = now + policy.cast_time
+        if power.duration:
+            active[rank].append((now, min(now + power.duration, seconds)))
+        ready[rank] = now + power.recharge
+        schedule(ready[rank], rank)
+        if power.resets:
+            for other in range(len(powers)):
+                if other != rank and ready[other] > now:
+                    ready[other] = now
+                    schedule(busy, other)
+
+    uptime = [_covered(intervals) for intervals in active]
+    weapon_power = _weapon_power(policy.family)
+    damage = [up * (power.dps + (power.weapon_bonus * weapon_dps if power.title == weapon_power else 0.0))
+              for power, up in zip(powers, uptime)]
+    titles = [power.title for power in powers]
+    return Report(
+        seconds,
+        dict(zip(titles, casts)),
+        {title: up / seconds for title, up in zip(titles, uptime)},
+        dict(zip(titles, damage)),
+        sum(damage) / seconds,
+        1.0 - _covered([interval for intervals in active for interval in intervals]) / seconds,
+    )
+
+
+def simulate_builds(builds: Iterable[Build], base_regen: float, seconds: float = 300.0,
+                    policy: Policy | None = None, family: str | None = None,
+                    weapon_dps: float = REFERENCE_WEAPON_DPS) -> list[Report]:
+    # Each build with the given policy, or its default_policy firing family
+    reports = []
+    for talents, ranks in builds:
+        build_kit = kit(Totals.from_ranks(talents, ranks), base_regen)
+        reports.append(simulate(build_kit, policy or default_policy(build_kit, family), seconds, weapon_dps))
+    return reports
+
+
+def format_report(report: Report) -> str:
+    lines = [f"{report.seconds:g} sec, {sm.truncate(report.dps)} DPS, idle {sm.truncate(report.idle * 100)}%"]
+    for title, count in report.casts.items():
+        lines.append(f"    {title}: {count} casts, uptime {sm.truncate(report.uptime[title] * 100)}%, "
+                     f"damage {sm.truncate(report.damage[title])}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import random
+    from presets import presets
+    from tables import MAX_RANK
+
+    rng = random.Random(0)
+    talent_sets = [preset.with_specialization(spec) for preset in presets.values() for spec in preset.specializations]
+    builds = [Build(talents, tuple(rng.randint(0, MAX_RANK) for _ in talents)) for talents in talent_sets for _ in range(200)]
+    # An assumed tenth of the pool per second; see the note at the top
+    base_regen = 0.1
+    print(format_report(simulate_builds(builds[:1], base_regen, family="Assault Rifles")[0]))
+    start = time.perf_counter()
+    simulate_builds(builds, base_regen, family="Assault Rifles")
+    elapsed = time.perf_counter() - start
+    print(f"{len(builds)} builds in {elapsed:.2f}s, {elapsed / len(builds) * 1e6:.0f} us per build")
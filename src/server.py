@@ -0,0 +1,257 @@
+import argparse
+import functools
+import hashlib
+import json
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import abilities as ab
+from batch import check_build, structure
+from codegen import evaluator, stats_evaluator, table_hash
+from model import Build
+from presets import presets, resolve
+import summarize as sm
+
+
+HOST: str = "127.0.0.1"
+# Bodies and batches beyond these are refused
+MAX_BODY: int = 4 * 1024 * 1024
+MAX_BATCH: int = 10000
+routes: frozenset[str] = frozenset({"/classes", "/evaluate", "/batch", "/metrics"})
+
+# Class name, specialization class name, ranks
+Key = tuple[str, str, tuple[int, ...]]
+
+
+class RequestError(ValueError):
+
+    def __init__(self, message: str, status: HTTPStatus = HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+def canonical(request: dict) -> Key:
+    # {"class": "soldier", "specialization": "SoldierCommando", "ranks": [...]},
+    # with names as presets.resolve takes them
+    if not isinstance(request, dict):
+        raise RequestError("Expected a build object")
+    try:
+        preset, spec = resolve(request.get("class"), request.get("specialization"))
+    except ValueError as error:
+        raise RequestError(str(error)) from None
+    ranks = request.get("ranks")
+    if not isinstance(ranks, list):
+        raise RequestError("Expected ranks as a list")
+    check_build(Build(preset.with_specialization(spec), tuple(ranks)))
+    return preset.name, spec.__name__, tuple(ranks)
+
+
+class Metrics:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Route -> [requests, total seconds, slowest seconds]
+        self.routes: dict[str, list] = {}
+        self.statuses: dict[int, int] = {}
+
+    def record(self, route: str, status: int, seconds: float):
+        with self.lock:
+            entry = self.routes.setdefault(route, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def report(self) -> dict:
+        with self.lock:
+            return {
+                "routes": {
+                    route: {"requests": count, "mean_ms": total / count * 1000, "max_ms": slowest * 1000}
+                    for route, (count, total, slowest) in self.routes.items()
+                },
+                "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            }
+
+
+class Service:
+
+    def __init__(self, cache_size: int = 4096):
+        # Every evaluator is compiled, or loaded from its cache, before serving
+        talent_sets = [preset.with_specialization(spec) for preset in presets.values() for spec in preset.specializations]
+        for talents in talent_sets:
+            evaluator(talents)
+            stats_evaluator(talents, ab.catalog)
+        # Part of every ETag, so a change to the tables or catalog changes them all
+        self.version: str = hashlib.sha256("".join(map(table_hash, talent_sets)).encode()).hexdigest()[:16]
+        self.evaluate = functools.lru_cache(cache_size)(self._evaluate)
+        self.metrics = Metrics()
+        self.classes: bytes = json.dumps({
+            preset.name: {
+                "talents": [talent.__name__ for talent in preset.talents],
+                "specializations": [spec.__name__ for spec in preset.specializations],
+            }
+            for preset in presets.values()
+        }).encode()
+
+    def _evaluate(self, key: Key) -> tuple[dict, str]:
+        # (response object, ETag); callers must not modify the object
+        name, spec_name, ranks = key
+        preset = presets[name]
+        talents = preset.with_specialization(resolve(name, spec_name)[1])
+        evaluation = structure(0, Build(talents, ranks), evaluator(talents)(ranks))
+        body = {
+            "class": name,
+            "specialization": spec_name,
+            "ranks": list(ranks),
+            "summaries": evaluation.summaries,
+            "stats": {sm.stat_name(stat): value for stat, value in evaluation.stats.items()},
+        }
+        etag = hashlib.sha256(f"{self.version} {key!r}".encode()).hexdigest()[:32]
+        return body, f'"{etag}"'
+
+    def cache_report(self) -> dict:
+        info = self.evaluate.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    # GET  /classes                               presets and their talents
+    # GET  /evaluate?class=..&specialization=..&ranks=1,2,..
+    # POST /evaluate   {"class", "specialization", "ranks"}
+    # POST /batch      {"builds": [...]} -> NDJSON, one line per build in order
+    # GET  /metrics                               request timings and cache use
+    protocol_version = "HTTP/1.1"
+    service: Service
+
+    def do_GET(self):
+        self.route("GET")
+
+    def do_POST(self):
+        self.route("POST")
+
+    def route(self, method: str):
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        # Set by send_response, so metrics count what the client was actually sent
+        self.status: int | None = None
+        try:
+            if method == "GET" and url.path == "/classes":
+                self.send_body(self.service.classes)
+            elif method == "GET" and url.path == "/metrics":
+                report = {**self.service.metrics.report(), "cache": self.service.cache_report()}
+                self.send_json(report)
+            elif url.path == "/evaluate":
+                self.evaluate(self.read_json() if method == "POST" else self.query(url.query))
+            elif method == "POST" and url.path == "/batch":
+                self.batch(self.read_json())
+            else:
+                raise RequestError(f"No route for {method} {url.path}", HTTPStatus.NOT_FOUND)
+        except RequestError as error:
+            self.send_json({"error": str(error)}, error.status)
+        finally:
+            # Unknown paths share one entry, so they cannot grow the metrics
+            route = url.path if url.path in routes else "other"
+            # None when an unexpected error dropped the connection before a response
+            status = HTTPStatus.INTERNAL_SERVER_ERROR if self.status is None else self.status
+            self.service.metrics.record(f"{method} {route}", status, time.perf_counter() - start)
+
+    def query(self, query: str) -> dict:
+        fields = {name: values[-1] for name, values in parse_qs(query).items()}
+        try:
+            ranks = [int(rank) for rank in fields.get("ranks", "").split(",") if rank]
+        except ValueError:
+            raise RequestError("Expected ranks as comma separated integers") from None
+        return {**fields, "ranks": ranks}
+
+    def read_json(self):
+        length_text = self.headers.get("Content-Length") or "0"
+        # Digits only: int() would also take "-1", " 1" or "1_0"
+        if not (length_text.isascii() and length_text.isdigit()):
+            self.close_connection = True
+            raise RequestError(f"Invalid Content-Length {length_text!r}")
+        length = int(length_text)
+        if length > MAX_BODY:
+            self.close_connection = True
+            raise RequestError(f"Body over {MAX_BODY} bytes", HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            raise RequestError("Body is not valid JSON") from None
+
+    def evaluate(self, request):
+        try:
+            key = canonical(request)
+        except ValueError as error:
+            raise RequestError(str(error)) from None
+        body, etag = self.service.evaluate(key)
+        if etag in (tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_json(body, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+    def batch(self, request):
+        builds = request.get("builds") if isinstance(request, dict) else None
+        if not isinstance(builds, list):
+            raise RequestError('Expected {"builds": [...]}')
+        if len(builds) > MAX_BATCH:
+            raise RequestError(f"At most {MAX_BATCH} builds per batch", HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        # Chunked, so each line goes out as soon as it is evaluated
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for index, build in enumerate(builds):
+            try:
+                line = {"index": index, **self.service.evaluate(canonical(build))[0]}
+            except ValueError as error:
+                line = {"index": index, "error": str(error)}
+            data = json.dumps(line).encode() + b"\n"
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def send_response(self, code: int, message: str | None = None):
+        self.status = code
+        super().send_response(code, message)
+
+    def send_json(self, body, status: HTTPStatus = HTTPStatus.OK, headers: dict[str, str] | None = None):
+        self.send_body(json.dumps(body).encode(), status, headers)
+
+    def send_body(self, data: bytes, status: HTTPStatus = HTTPStatus.OK, headers: dict[str, str] | None = None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args):
+        # Timings are in /metrics; keep stderr for errors
+        pass
+
+
+def serve(port: int = 8765, cache_size: int = 4096) -> ThreadingHTTPServer:
+    # Only ever bound to the loopback interface
+    handler = type("BoundHandler", (Handler, ), {"service": Service(cache_size)})
+    return ThreadingHTTPServer((HOST, port), handler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve build evaluations on localhost")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cache-size", type=int, default=4096)
+    arguments = parser.parse_args()
+    httpd = serve(arguments.port, arguments.cache_size)
+    print(f"Serving on http://{HOST}:{httpd.server_port}")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
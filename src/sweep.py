@@ -0,0 +1,342 @@
+import argparse
+import heapq
+import json
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator, Sequence
+from typing import NamedTuple
+
+import abilities as ab
+from codegen import stats_evaluator
+from model import lvl_to_pts, MAX_LEVEL, MAX_RANK
+from presets import resolve
+import summarize as sm
+import talents as tl
+
+
+# (score, -index), so the largest are the best and ties go to the lowest index
+Candidate = tuple[float, int]
+
+
+class BuildSpace:
+
+    # Every build a TreeModel at level could hold, in lexicographic order of
+    # ranks: each rank within 0-min(MAX_RANK, level + 1), at most the level's
+    # points in total. Builds are addressed by their index in that order.
+    def __init__(self, talents: Sequence[type[tl.Talent]], level: int):
+        if not 1 <= level <= MAX_LEVEL:
+            raise ValueError(f"Level {level} outside of 1-{MAX_LEVEL}")
+        self.talents = tuple(talents)
+        self.cap: int = min(MAX_RANK, level + 1)
+        self.points: int = lvl_to_pts[level]
+        # ways[i][p]: ways to rank talents i onwards with at most p points
+        self.ways: list[list[int]] = [[1] * (self.points + 1)]
+        for _ in self.talents:
+            after = self.ways[0]
+            self.ways.insert(0, [sum(after[p - rank] for rank in range(min(self.cap, p) + 1)) for p in range(self.points + 1)])
+
+    def __len__(self) -> int:
+        return self.ways[0][self.points]
+
+    def unrank(self, index: int) -> tuple[int, ...]:
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        ranks: list[int] = []
+        points = self.points
+        for position in range(len(self.talents)):
+            rank = 0
+            while index >= self.ways[position + 1][points - rank]:
+                index -= self.ways[position + 1][points - rank]
+                rank += 1
+            ranks.append(rank)
+            points -= rank
+        return tuple(ranks)
+
+    def iterate(self, start: int, stop: int) -> Iterator[tuple[int, ...]]:
+        # Builds start to stop, stepping from one to the next instead of unranking each
+        if start >= stop:
+            return
+        ranks = list(self.unrank(start))
+        spent = sum(ranks)
+        for _ in range(stop - start - 1):
+            yield tuple(ranks)
+            # The next build raises the last rank that can take another point
+            position = len(ranks) - 1
+            while ranks[position] == self.cap or spent - sum(ranks[position + 1:]) >= self.points:
+                position -= 1
+            spent -= sum(ranks[position + 1:])
+            ranks[position + 1:] = [0] * (len(ranks) - position - 1)
+            ranks[position] += 1
+            spent += 1
+        yield tuple(ranks)
+
+
+class Job(NamedTuple):
+    class_name: str
+    specialization: str | None
+    level: int
+    # A stat as summarize.stat_name names it, e.g. "Warp: Duration # sec";
+    # a name rather than a StatKey so jobs travel as JSON
+    stat: str
+    top: int
+
+    def space(self) -> BuildSpace:
+        preset, spec = resolve(self.class_name, self.specialization)
+        return BuildSpace(preset.with_specialization(spec), self.level)
+
+
+def scorer(job: Job) -> Callable[[Sequence[int]], float | None]:
+    # Ranks -> the stat's value, signed so that larger is better; None when the
+    # build does not have the stat. Scores are unrounded.
+    stat = sm.parse_stat(job.stat)
+    ability = next(ability for ability in ab.catalog if ability.title == stat[0])
+    position = [entry.template for entry in ability.stats].index(stat[1])
+    evaluate = stats_evaluator(job.space().talents, (ability, ))
+    sign = -1.0 if sm.is_lower_better(stat) else 1.0
+
+    def score(ranks: Sequence[int]) -> float | None:
+        values = evaluate(ranks)[0]
+        return sign * values[position] if values else None
+
+    return score
+
+
+def scan(job: Job, start: int, stop: int, heartbeat: Callable[[int], None] = lambda done: None,
+         interval: float = 1.0) -> tuple[list[Candidate], int]:
+    # The best job.top candidates among builds start to stop, and how many had the stat
+    score = scorer(job)
+    best: list[Candidate] = []
+    found = 0
+    last = time.monotonic()
+    for index, ranks in enumerate(job.space().iterate(start, stop), start):
+        value = score(ranks)
+        if value is not None:
+            found += 1
+            if len(best) < job.top:
+                heapq.heappush(best, (value, -index))
+            elif (value, -index) > best[0]:
+                heapq.heapreplace(best, (value, -index))
+        if index % 256 == 0 and time.monotonic() - last >= interval:
+            heartbeat(index - start)
+            last = time.monotonic()
+    return best, found
+
+
+def merge(parts: Sequence[Sequence[Candidate]], top: int) -> list[Candidate]:
+    return heapq.nlargest(top, (candidate for part in parts for candidate in part))
+
+
+# Both directions speak one JSON object per line:
+#   worker: hello, next, heartbeat {shard, done}, result {shard, top, found}
+#   coordinator: job, shard {shard, start, stop}, wait {seconds}, done
+def send(stream, message: dict):
+    stream.write(json.dumps(message).encode() + b"\n")
+    stream.flush()
+
+
+def receive(stream) -> dict:
+    line = stream.readline()
+    if not line:
+        raise ConnectionError("Connection closed")
+    return json.loads(line)
+
+
+class Shard(NamedTuple):
+    ident: int
+    start: int
+    stop: int
+
+
+class Coordinator:
+
+    def __init__(self, job: Job, shard_size: int = 20000, timeout: float = 10.0):
+        self.job = job
+        self.space = job.space()
+        self.timeout = timeout
+        self.shards: list[Shard] = [
+            Shard(ident, start, min(start + shard_size, len(self.space)))
+            for ident, start in enumerate(range(0, len(self.space), shard_size))
+        ]
+        self.pending: deque[Shard] = deque(self.shards)
+        # Shard id -> (worker, deadline); a heartbeat moves the deadline
+        self.assigned: dict[int, tuple[str, float]] = {}
+        # Shard id -> its candidates, kept until merged
+        self.results: dict[int, list[Candidate]] = {}
+        self.found: int = 0
+        self.reassigned: int = 0
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+        if not self.shards:
+            self.finished.set()
+
+    def next_shard(self, worker: str) -> Shard | None:
+        # None while every remaining shard is out with another worker
+        with self.lock:
+            self._expire()
+            if not self.pending:
+                return None
+            shard = self.pending.popleft()
+            self.assigned[shard.ident] = (worker, time.monotonic() + self.timeout)
+            return shard
+
+    def heartbeat(self, worker: str, ident: int):
+        with self.lock:
+            if self.assigned.get(ident, (None, ))[0] == worker:
+                self.assigned[ident] = (worker, time.monotonic() + self.timeout)
+
+    def complete(self, worker: str, ident: int, candidates: list[Candidate], found: int):
+        # A late result for a shard already finished elsewhere is dropped
+        with self.lock:
+            if ident in self.results:
+                return
+            self.assigned.pop(ident, None)
+            if any(shard.ident == ident for shard in self.pending):
+                self.pending = deque(shard for shard in self.pending if shard.ident != ident)
+            self.results[ident] = merge([candidates], self.job.top)
+            self.found += found
+            if len(self.results) == len(self.shards):
+                self.finished.set()
+
+    def release(self, worker: str):
+        # A worker went away; its shards go back to the front of the queue
+        with self.lock:
+            for ident, (owner, _) in list(self.assigned.items()):
+                if owner == worker:
+                    self._reassign(ident)
+
+    def _expire(self):
+        now = time.monotonic()
+        for ident, (_, deadline) in list(self.assigned.items()):
+            if deadline < now:
+                self._reassign(ident)
+
+    def _reassign(self, ident: int):
+        del self.assigned[ident]
+        self.pending.appendleft(self.shards[ident])
+        self.reassigned += 1
+
+    def best(self) -> list[tuple[float, tuple[int, ...]]]:
+        # (stat value, ranks), best first
+        with self.lock:
+            candidates = merge(list(self.results.values()), self.job.top)
+        sign = -1.0 if sm.is_lower_better(sm.parse_stat(self.job.stat)) else 1.0
+        return [(sign * score, self.space.unrank(-negative)) for score, negative in candidates]
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    coordinator: Coordinator
+
+    def handle(self):
+        coordinator = self.coordinator
+        worker = f"{self.client_address[0]}:{self.client_address[1]}"
+        try:
+            hello = receive(self.rfile)
+            worker = f"{hello.get('worker', '')}@{worker}"
+            send(self.wfile, {"type": "job", "job": coordinator.job._asdict()})
+            while True:
+                message = receive(self.rfile)
+                if message["type"] == "heartbeat":
+                    coordinator.heartbeat(worker, message["shard"])
+                elif message["type"] == "result":
+                    candidates = [(score, negative) for score, negative in message["top"]]
+                    coordinator.complete(worker, message["shard"], candidates, message["found"])
+                elif message["type"] == "next":
+                    if coordinator.finished.is_set():
+                        send(self.wfile, {"type": "done"})
+                        return
+                    shard = coordinator.next_shard(worker)
+                    if shard is None:
+                        send(self.wfile, {"type": "wait", "seconds": min(1.0, coordinator.timeout / 4)})
+                    else:
+                        send(self.wfile, {"type": "shard", "shard": shard.ident, "start": shard.start, "stop": shard.stop})
+        except (ConnectionError, OSError, ValueError, KeyError):
+            pass
+        finally:
+            coordinator.release(worker)
+
+
+def coordinate(coordinator: Coordinator, host: str = "127.0.0.1", port: int = 0) -> socketserver.ThreadingTCPServer:
+    # Serves coordinator on a background thread; port 0 picks a free port
+    handler = type("BoundHandler", (_Handler, ), {"coordinator": coordinator})
+    server = socketserver.ThreadingTCPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def work(host: str, port: int, name: str = "", heartbeat_interval: float = 1.0) -> int:
+    # Evaluates shards until the coordinator is done; returns how many it did
+    shards = 0
+    with socket.create_connection((host, port)) as connection, connection.makefile("rwb") as stream:
+        send(stream, {"type": "hello", "worker": name})
+        job = Job(**receive(stream)["job"])
+        while True:
+            send(stream, {"type": "next"})
+            reply = receive(stream)
+            if reply["type"] == "done":
+                return shards
+            if reply["type"] == "wait":
+                time.sleep(reply["seconds"])
+                continue
+            ident = reply["shard"]
+
+            def heartbeat(done: int):
+                send(stream, {"type": "heartbeat", "shard": ident, "done": done})
+
+            candidates, found = scan(job, reply["start"], reply["stop"], heartbeat, heartbeat_interval)
+            send(stream, {"type": "result", "shard": ident, "top": candidates, "found": found})
+            shards += 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep every legal build of a class for the best value of a stat")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for command in ("local", "coordinate"):
+        sub = commands.add_parser(command)
+        sub.add_argument("class_name", metavar="class")
+        sub.add_argument("stat", help='as in summaries, e.g. "Warp: Duration # sec"')
+        sub.add_argument("--specialization")
+        sub.add_argument("--level", type=int, default=MAX_LEVEL)
+        sub.add_argument("--top", type=int, default=10)
+        sub.add_argument("--shard-size", type=int, default=20000)
+        sub.add_argument("--timeout", type=float, default=10.0)
+        sub.add_argument("--host", default="127.0.0.1", help="listen address; 0.0.0.0 to take remote workers")
+        sub.add_argument("--port", type=int, default=0)
+    commands.choices["local"].add_argument("--workers", type=int, default=4)
+    sub = commands.add_parser("work")
+    sub.add_argument("--host", default="127.0.0.1")
+    sub.add_argument("--port", type=int, required=True)
+    sub.add_argument("--name", default=socket.gethostname())
+    arguments = parser.parse_args()
+
+    if arguments.command == "work":
+        work(arguments.host, arguments.port, arguments.name)
+        sys.exit()
+
+    job = Job(arguments.class_name, arguments.specialization, arguments.level, arguments.stat, arguments.top)
+    coordinator = Coordinator(job, arguments.shard_size, arguments.timeout)
+    server = coordinate(coordinator, arguments.host, arguments.port)
+    port = server.server_address[1]
+    print(f"{len(coordinator.space)} builds in {len(coordinator.shards)} shards, coordinating on port {port}", file=sys.stderr)
+    processes = []
+    if arguments.command == "local":
+        processes = [
+            subprocess.Popen([sys.executable, __file__, "work", "--port", str(port), "--name", f"local{number}"])
+            for number in range(arguments.workers)
+        ]
+    start = time.perf_counter()
+    while not coordinator.finished.wait(5.0):
+        print(f"{len(coordinator.results)}/{len(coordinator.shards)} shards", file=sys.stderr)
+    for process in processes:
+        process.wait()
+    server.shutdown()
+    print(f"Done in {time.perf_counter() - start:.1f}s, {coordinator.found} builds with the stat, "
+          f"{coordinator.reassigned} shards reassigned", file=sys.stderr)
+    for value, ranks in coordinator.best():
+        print(f"{sm.display_value(sm.parse_stat(job.stat), value)}\t{' '.join(map(str, ranks))}")
@@ -0,0 +1,216 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import NamedTuple
+
+from enums import AbilityLevel, BaseValue, Modifier, Specialization
+
+
+MAX_RANK: int = 12
+
+source_path: Path = Path(__file__).with_name("talents.json")
+cache_path: Path = Path(__file__).with_name("__pycache__") / "talents.tables"
+
+Key = Modifier | BaseValue | AbilityLevel | Specialization
+# Rank -> Value at Rank
+Lookup = dict[int, float]
+
+key_kinds: tuple[type[Key], ...] = (Modifier, BaseValue, AbilityLevel, Specialization)
+
+
+class TableError(ValueError):
+    pass
+
+
+class TalentData(NamedTuple):
+    # Class name in talents.py, e.g. "AdeptBastion"
+    ident: str
+    # Display name, e.g. "Bastion"
+    name: str
+    extends: str | None
+    # Fully resolved, including anything inherited through extends
+    modifier_table: dict[Modifier | BaseValue, Lookup]
+    ability_table: dict[AbilityLevel | Specialization, Lookup]
+
+
+def parse_key(text: str, allowed: tuple[type[Key], ...], where: str) -> Key:
+    kind_name, _, member = text.partition(".")
+    for kind in allowed:
+        if kind.__name__ == kind_name and member in kind.__members__:
+            return kind[member]
+    raise TableError(f"{where}: unknown key {text!r}, expected one of {', '.join(kind.__name__ for kind in allowed)}")
+
+
+def parse_lookup(value: object, key: Key, tables: dict[str, Lookup], where: str) -> Lookup:
+    if isinstance(value, str):
+        if value not in tables:
+            raise TableError(f"{where}: unknown table {value!r}")
+        return tables[value]
+    if not isinstance(value, dict):
+        raise TableError(f"{where}: expected a table or table name, got {value!r}")
+    lookup: Lookup = {}
+    previous = 0
+    for rank_text, amount in value.items():
+        if not rank_text.isdigit() or not 1 <= int(rank_text) <= MAX_RANK:
+            raise TableError(f"{where}: rank {rank_text!r} outside of 1-{MAX_RANK}")
+        rank = int(rank_text)
+        if rank <= previous:
+            raise TableError(f"{where}: rank {rank} after rank {previous}, thresholds must increase")
+        previous = rank
+        if isinstance(key, Specialization):
+            valid = amount is True
+        elif isinstance(key, AbilityLevel):
+            valid = type(amount) is int and 1 <= amount <= 3
+        else:
+            valid = type(amount) in (int, float)
+        if not valid:
+            raise TableError(f"{where}: invalid value {amount!r} at rank {rank}")
+        lookup[rank] = amount
+    return lookup
+
+
+def parse(document: dict) -> list[TalentData]:
+    # Validates the whole document; definitions must come after what they extend
+    talents: dict[str, TalentData] = {}
+    named_tables: dict[str, dict[str, Lookup]] = {}
+    for ident, definition in document.items():
+        unknown = definition.keys() - {"name", "extends", "notes", "tables", "abilities", "modifiers"}
+        if unknown:
+            raise TableError(f"{ident}: unknown fields {sorted(unknown)}")
+        if not isinstance(definition.get("name"), str):
+            raise TableError(f"{ident}: missing name")
+        extends = definition.get("extends")
+        if extends is not None and extends not in talents:
+            raise TableError(f"{ident}: extends {extends!r}, which is not defined before it")
+        parent = talents.get(extends)
+        tables = dict(named_tables.get(extends, {}))
+        for table_name, value in definition.get("tables", {}).items():
+            tables[table_name] = parse_lookup(value, Modifier.HEALTH, {}, f"{ident}.tables.{table_name}")
+        modifier_table = dict(parent.modifier_table) if parent else {}
+        for key_text, value in definition.get("modifiers", {}).items():
+            where = f"{ident}.modifiers.{key_text}"
+            key = parse_key(key_text, (Modifier, BaseValue), where)
+            modifier_table[key] = parse_lookup(value, key, tables, where)
+        ability_table = dict(parent.ability_table) if parent else {}
+        for key_text, value in definition.get("abilities", {}).items():
+            where = f"{ident}.abilities.{key_text}"
+            key = parse_key(key_text, (AbilityLevel, Specialization), where)
+            ability_table[key] = parse_lookup(value, key, tables, where)
+        talents[ident] = TalentData(ident, definition["name"], extends, modifier_table, ability_table)
+        named_tables[ident] = tables
+    return list(talents.values())
+
+
+# Compiled layout, little-endian:
+#   header: magic, version, source mtime (ns), source sha256, talent count
+#   per talent: ident, name, extends (length-prefixed UTF-8, empty for none), entry count
+#   per entry: key kind, key value, threshold count, then (rank, integer flag, value) triples
+MAGIC: bytes = b"MECT"
+VERSION: int = 1
+header_format = struct.Struct("<4sHq32sH")
+string_format = struct.Struct("<B")
+count_format = struct.Struct("<H")
+entry_format = struct.Struct("<BBB")
+pair_format = struct.Struct("<BBd")
+
+
+def _pack_string(text: str) -> bytes:
+    data = text.encode()
+    return string_format.pack(len(data)) + data
+
+
+def _unpack_string(buffer, offset: int) -> tuple[str, int]:
+    (length, ) = string_format.unpack_from(buffer, offset)
+    offset += string_format.size
+    return bytes(buffer[offset:offset + length]).decode(), offset + length
+
+
+def compile_tables(talents: list[TalentData], mtime_ns: int, digest: bytes) -> bytes:
+    chunks = [header_format.pack(MAGIC, VERSION, mtime_ns, digest, len(talents))]
+    for talent in talents:
+        entries = [*talent.modifier_table.items(), *talent.ability_table.items()]
+        chunks += [_pack_string(talent.ident), _pack_string(talent.name), _pack_string(talent.extends or "")]
+        chunks.append(count_format.pack(len(entries)))
+        for key, lookup in entries:
+            chunks.append(entry_format.pack(key_kinds.index(type(key)), key.value, len(lookup)))
+            chunks += [pair_format.pack(rank, type(amount) is int, amount) for rank, amount in lookup.items()]
+    return b"".join(chunks)
+
+
+def load_compiled(buffer) -> list[TalentData]:
+    (_, _, _, _, count) = header_format.unpack_from(buffer, 0)
+    offset = header_format.size
+    talents: list[TalentData] = []
+    for _ in range(count):
+        ident, offset = _unpack_string(buffer, offset)
+        name, offset = _unpack_string(buffer, offset)
+        extends, offset = _unpack_string(buffer, offset)
+        (entries, ) = count_format.unpack_from(buffer, offset)
+        offset += count_format.size
+        modifier_table: dict[Modifier | BaseValue, Lookup] = {}
+        ability_table: dict[AbilityLevel | Specialization, Lookup] = {}
+        for _ in range(entries):
+            kind, value, thresholds = entry_format.unpack_from(buffer, offset)
+            offset += entry_format.size
+            key = key_kinds[kind](value)
+            lookup: Lookup = {}
+            for _ in range(thresholds):
+                rank, integer, amount = pair_format.unpack_from(buffer, offset)
+                offset += pair_format.size
+                if isinstance(key, Specialization):
+                    amount = bool(amount)
+                elif integer:
+                    amount = int(amount)
+                lookup[rank] = amount
+            table = ability_table if isinstance(key, (AbilityLevel, Specialization)) else modifier_table
+            table[key] = lookup
+        talents.append(TalentData(ident, name, extends or None, modifier_table, ability_table))
+    return talents
+
+
+def _read_cache(mtime_ns: int) -> tuple[bytes, list[TalentData]] | None:
+    # (stored source digest, tables) when the cache exists and is this version
+    try:
+        with open(cache_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            magic, version, cached_mtime, digest, _ = header_format.unpack_from(buffer, 0)
+            if magic != MAGIC or version != VERSION:
+                return None
+            if cached_mtime == mtime_ns:
+                return digest, load_compiled(buffer)
+            return digest, []
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def load(path: Path = source_path) -> list[TalentData]:
+    # The compiled cache is trusted while the source's mtime is unchanged. If
+    # only the mtime moved, the source hash decides whether to recompile.
+    mtime_ns = os.stat(path).st_mtime_ns
+    use_cache = path == source_path
+    cached = _read_cache(mtime_ns) if use_cache else None
+    if cached and cached[1]:
+        return cached[1]
+    source = path.read_bytes()
+    digest = hashlib.sha256(source).digest()
+    talents = None
+    if cached and cached[0] == digest:
+        # The header can be intact over a truncated or corrupt body
+        try:
+            with open(cache_path, "rb") as file:
+                talents = load_compiled(file.read())
+        except (OSError, ValueError, EOFError, IndexError, struct.error):
+            talents = None
+    if talents is None:
+        talents = parse(json.loads(source))
+    if use_cache:
+        try:
+            cache_path.parent.mkdir(exist_ok=True)
+            partial = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            partial.write_bytes(compile_tables(talents, mtime_ns, digest))
+            os.replace(partial, cache_path)
+        except OSError:
+            pass
+    return talents
@@ -1,60 +1,86 @@
-from pathlib import Path
-
-from PyQt5 import uic
-from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import pyqtSlot, QEvent, QPoint
+from PyQt5.QtWidgets import QHBoxLayout, QPushButton, QToolTip, QWidget
 
 import summarize as sm
+from uicache import form_class
+from widgets import ComparisonTable
 
 
-class MainWidget(QWidget):
+class MainWidget(QWidget, form_class("test.ui")):
 
     def __init__(self, parent=None):
 
         super().__init__(parent)
-        uic.loadUi(Path(__file__).with_name("test.ui"), self)
+        self.setupUi(self)
+
+        self.compareLayout = QHBoxLayout()
+        self.compareButton = QPushButton("Add to Comparison", self)
+        self.clearCompareButton = QPushButton("Clear Comparison", self)
+        self.compareLayout.addWidget(self.compareButton)
+        self.compareLayout.addWidget(self.clearCompareButton)
+        self.verticalLayout_2.addLayout(self.compareLayout)
+        self.comparisonTable = ComparisonTable()
 
-        self.talentTree.set_class_soldier()
-        self.adjustSize()
-        
         self.summaryButton.clicked.connect(self.summarizeButton_clicked)
+        self.compareButton.clicked.connect(self.compareButton_clicked)
+        self.clearCompareButton.clicked.connect(self.comparisonTable.clear_builds)
+        self.summaryTextEdit.viewport().installEventFilter(self)
+        self.talentTree.speculator.summariesChanged.connect(self.speculator_summariesChanged)
+
+        self.talentTree.set_class("Soldier")
+        self.adjustSize()
 
     def summarizeButton_clicked(self):
+        self.show_summaries(sm.summarize_all(self.talentTree.get_talents()))
+
+    def eventFilter(self, obj, event):
+        if obj is self.summaryTextEdit.viewport():
+            if event.type() == QEvent.ToolTip:
+                self.show_trace(event.pos(), event.globalPos())
+                return True
+            if event.type() == QEvent.Leave:
+                self.talentTree.highlight_summary(None)
+        return super().eventFilter(obj, event)
+
+    def show_trace(self, pos: QPoint, global_pos: QPoint):
+        # Summary lines are indented under their unindented title line
+        block = self.summaryTextEdit.cursorForPosition(pos).block()
+        title = block
+        while title.isValid() and title.text().startswith(" "):
+            title = title.previous()
+        if not title.isValid():
+            QToolTip.hideText()
+            return
+        name = sm.strip_title(title.text())[0]
+        self.talentTree.highlight_summary(name)
+        if title == block:
+            QToolTip.hideText()
+            return
+        stat = sm.line_stat(name, block.text())
+        if stat is None:
+            QToolTip.hideText()
+            return
+        # Only needed once a tooltip is shown, so not imported at startup
+        import traces
+        try:
+            trace = traces.trace(self.talentTree.get_talents(), stat)
+        except KeyError:
+            QToolTip.hideText()
+            return
+        QToolTip.showText(global_pos, traces.format_trace(trace), self.summaryTextEdit)
+
+    def compareButton_clicked(self):
+        self.comparisonTable.add_build(self.talentTree.model.snapshot(), self.talentTree.build_name())
+        self.comparisonTable.show()
+
+    @pyqtSlot(list)
+    def speculator_summariesChanged(self, summaries: list[str]):
+        self.show_summaries(summaries)
+
+    def show_summaries(self, summaries: list[str]):
         self.summaryTextEdit.clear()
-        talents = self.talentTree.get_talents()
-        for summarize in (
-            sm.summarize_Shepard,
-            sm.summarize_First_Aid,
-            sm.summarize_Pistol,
-            sm.summarize_Assault_Rifle,
-            sm.summarize_Shotgun,
-            sm.summarize_Sniper_Rifles,
-            sm.summarize_Adrenaline_Burst,
-            sm.summarize_Immunity,
-            sm.summarize_Marksman,
-            sm.summarize_Overkill,
-            sm.summarize_Carnage,
-            sm.summarize_Assassination,
-            sm.summarize_Light_Armor,
-            sm.summarize_Medium_Armor,
-            sm.summarize_Heavy_Armor,
-            sm.summarize_Shield_Boost,
-            sm.summarize_Sabotage,
-            sm.summarize_Overload,
-            sm.summarize_AI_Hacking,
-            sm.summarize_Damping,
-            sm.summarize_Neural_Shock,
-            sm.summarize_Barrier,
-            sm.summarize_Lift,
-            sm.summarize_Singularity,
-            sm.summarize_Stasis,
-            sm.summarize_Throw,
-            sm.summarize_Warp,
-            sm.summarize_Unity,
-            sm.summarize_Mako,
-        ):
-            summary = summarize(talents)
-            if summary:
-                self.summaryTextEdit.append(summary)
+        for summary in summaries:
+            self.summaryTextEdit.append(summary)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,64 @@
+import functools
+from collections.abc import Iterable, Mapping, Sequence
+
+from enums import AbilityLevel, Specialization
+from talents import Talent
+from vectors import ModifierVector
+
+
+Contribution = tuple[ModifierVector, Mapping[AbilityLevel | Specialization, int]]
+
+
+@functools.cache
+def contribution(talent: type[Talent], rank: int) -> Contribution:
+    # Shared between every Totals using this talent at this rank; never mutate
+    instance = talent(rank)
+    return ModifierVector.from_mapping(instance.get_modifiers()), instance.get_abilities()
+
+
+# A stand-in talent carrying a whole build's aggregated modifiers and abilities,
+# so summarizers can be run on [totals] instead of on every talent. Modifiers are
+# summed; base values, ability levels and specializations take the highest value.
+class Totals(Talent):
+
+    name = "<TOTALS>"
+
+    def __init__(self, talents: Sequence[Talent] = ()):
+        super().__init__(0)
+        self.ability_levels: dict[AbilityLevel | Specialization, int] = {}
+        # Per-talent modifiers and abilities, kept so one talent can be swapped out
+        self.contributions: list[Contribution] = [
+            (ModifierVector.from_mapping(talent.get_modifiers()), talent.get_abilities()) for talent in talents
+        ]
+        self.modifiers: ModifierVector = ModifierVector()
+        self._recompute({key for _, abilities in self.contributions for key in abilities})
+
+    def _recompute(self, ability_keys: Iterable[AbilityLevel | Specialization]):
+        self.modifiers = ModifierVector.total(vector for vector, _ in self.contributions)
+        for key in ability_keys:
+            self.ability_levels[key] = max(abilities.get(key, 0) for _, abilities in self.contributions)
+
+    @classmethod
+    def from_ranks(cls, talents: Iterable[type[Talent]], ranks: Iterable[int]) -> "Totals":
+        totals = cls()
+        totals.contributions = [contribution(talent, rank) for talent, rank in zip(talents, ranks)]
+        totals._recompute({key for _, abilities in totals.contributions for key in abilities})
+        return totals
+
+    def replace(self, index: int, talent: Talent) -> "Totals":
+        # Totals with the talent at index swapped out. Modifiers are re-aggregated,
+        # which is a few vector operations; abilities only for the keys it touches.
+        totals = Totals()
+        totals.contributions = list(self.contributions)
+        totals.ability_levels = dict(self.ability_levels)
+        old_abilities = self.contributions[index][1]
+        new_abilities = talent.get_abilities()
+        totals.contributions[index] = (ModifierVector.from_mapping(talent.get_modifiers()), new_abilities)
+        totals._recompute(old_abilities.keys() | new_abilities.keys())
+        return totals
+
+    def get_modifiers(self) -> ModifierVector:
+        return self.modifiers
+
+    def get_abilities(self) -> dict[AbilityLevel | Specialization, int]:
+        return self.ability_levels
@@ -0,0 +1,127 @@
+from collections.abc import Callable, Iterable, Sequence
+from typing import NamedTuple
+
+import abilities as ab
+from enums import BaseValue, Modifier, Specialization
+import summarize as sm
+import talents as tl
+from totals import Totals
+
+
+Summarizer = Callable[[Iterable[tl.Talent]], str]
+# (talent name, rank, value contributed)
+Source = tuple[str, int, float]
+
+
+class Term(NamedTuple):
+    key: Modifier | Specialization
+    # "abs": added to the base value, "bonus": inside (1 + ...), "haste": inside (1 - ...)
+    kind: str
+    value: float
+    sources: list[Source]
+
+
+class Trace(NamedTuple):
+    stat: sm.StatKey
+    value: float
+    # Ability level the base value comes from, 0 if it doesn't depend on one
+    level: int
+    base: float
+    # Talent table the base value comes from, if any
+    base_key: BaseValue | None
+    base_sources: list[Source]
+    terms: list[Term]
+    formula: str
+
+
+def summarizer_for(stat: sm.StatKey) -> Summarizer:
+    for summarizer in sm.summarizers:
+        if summarizer.ability.title == stat[0]:
+            return summarizer
+    raise KeyError(stat)
+
+
+def get_sources(talents: Iterable[tl.Talent], key: Modifier | BaseValue | Specialization) -> list[Source]:
+    sources: list[Source] = []
+    for talent in talents:
+        values = talent.get_abilities() if isinstance(key, Specialization) else talent.get_modifiers()
+        if values.get(key):
+            sources.append((talent.name, talent.rank, values[key]))
+    return sources
+
+
+def _terms(talents: Sequence[tl.Talent], totals: Totals, kind: str, keys: Iterable[Modifier],
+           spec: Specialization | None, spec_value: float) -> list[Term]:
+    # One term per modifier of a step of calculate_stat, in the same order
+    terms = [Term(key, kind, totals.modifiers.get(key), get_sources(talents, key))
+             for key in keys if totals.modifiers.get(key)]
+    if spec is not None and spec_value:
+        terms.append(Term(spec, kind, spec_value, get_sources(talents, spec)))
+    return terms
+
+
+def _format_term(term: Term) -> str:
+    name = f"{term.key.name} spec" if isinstance(term.key, Specialization) else term.key.name
+    return f"{sm.truncate(term.value)} {name}"
+
+
+def _format_formula(stat: sm.StatKey, value: float, base: float, base_key: BaseValue | None,
+                    terms: list[Term]) -> str:
+    if base_key is not None:
+        expression = f"max({base_key.name}) {sm.truncate(base)}"
+    else:
+        expression = f"{sm.truncate(base)}"
+    absolute = [_format_term(term) for term in terms if term.kind == "abs"]
+    bonus = [_format_term(term) for term in terms if term.kind == "bonus"]
+    haste = [_format_term(term) for term in terms if term.kind == "haste"]
+    if absolute:
+        expression = f"({' + '.join([expression] + absolute)})"
+    if bonus:
+        expression += f" × (1 + {' + '.join(bonus)})"
+    if haste:
+        expression += f" × (1 − {' − '.join(haste)})"
+    return f"{sm.stat_name(stat)} = {expression} = {sm.truncate(value)}"
+
+
+def trace(talents: Sequence[tl.Talent], stat: sm.StatKey) -> Trace:
+    # Nothing here runs during normal summarizing: a trace walks the steps of
+    # summarize.calculate_stat for the one stat, recording where each number
+    # comes from.
+    ability = summarizer_for(stat).ability
+    entry: ab.Stat | None = next((entry for entry in ability.stats if entry.template == stat[1]), None)
+    if entry is None:
+        raise KeyError(stat)
+    totals = Totals(talents)
+    level = sm.get_ability_level([totals], ability.level) if ability.level else 1
+    if level == 0:
+        raise KeyError(stat)
+    specialized = bool(ability.specialization) and sm.get_ability_specialization([totals], ability.specialization)
+    spec = ability.specialization if specialized else None
+
+    if isinstance(entry.base, BaseValue):
+        base_key, base = entry.base, sm.get_highest_value([totals], entry.base)
+        base_level, base_sources = 0, get_sources(talents, entry.base)
+    else:
+        base_key, base = None, entry.base[level - 1]
+        base_level, base_sources = level if ability.level else 0, []
+    terms = (_terms(talents, totals, "abs", entry.additions, spec, entry.spec_add)
+             + _terms(talents, totals, "bonus", entry.bonuses, spec, entry.spec_bonus)
+             + _terms(talents, totals, "haste", entry.haste, spec, entry.spec_haste))
+    value = sm.calculate_stat([totals], entry, level, specialized)
+    formula = _format_formula(stat, value, base, base_key, terms)
+    return Trace(stat, value, base_level, base, base_key, base_sources, terms, formula)
+
+
+def format_trace(trace: Trace) -> str:
+    lines = [trace.formula]
+    if trace.level:
+        lines.append(f"Ability level {trace.level}")
+    base_from = f" ({trace.base_key.name})" if trace.base_key else ""
+    lines.append(f"Base {sm.truncate(trace.base)}{base_from}")
+    for name, rank, value in trace.base_sources:
+        lines.append(f"    {name} {rank}: {sm.truncate(value)}")
+    for term in trace.terms:
+        lines.append(f"{term.key.name} ({term.kind}) {sm.truncate(term.value)}")
+        for name, rank, value in term.sources:
+            lines.append(f"    {name} {rank}: {sm.truncate(value) if value is not True else 'yes'}")
+    return "\n".join(lines)
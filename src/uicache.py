@@ -0,0 +1,46 @@
+import importlib.util
+import io
+import os
+from pathlib import Path
+
+
+cache_dir: Path = Path(__file__).with_name("__pycache__") / "ui"
+
+
+def _cached_mtime(path: Path) -> int | None:
+    # Generated modules start with "# mtime <ns>" of the .ui file they came from
+    try:
+        with open(path, encoding="utf-8") as file:
+            first = file.readline()
+    except OSError:
+        return None
+    prefix, _, mtime = first.strip().partition(" mtime ")
+    return int(mtime) if prefix == "#" and mtime.isdigit() else None
+
+
+def generate(source: Path, target: Path, mtime_ns: int):
+    # uic parses the XML, so it is only imported when a .ui file has changed
+    from PyQt5 import uic
+    buffer = io.StringIO()
+    uic.compileUi(str(source), buffer)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_suffix(f".{os.getpid()}.tmp")
+    partial.write_text(f"# mtime {mtime_ns}\n{buffer.getvalue()}", encoding="utf-8")
+    os.replace(partial, target)
+
+
+def form_class(name: str) -> type:
+    # The Ui_ class pyuic5 generates for the named .ui file next to this one.
+    # Use as a mixin and call self.setupUi(self), which gives the same widget
+    # attributes and slot connections as uic.loadUi without parsing XML on
+    # every launch: the module is regenerated only when the .ui mtime changes,
+    # and is otherwise imported from its bytecode like any other module.
+    source = Path(__file__).with_name(name)
+    target = cache_dir / f"ui_{source.stem}.py"
+    mtime_ns = source.stat().st_mtime_ns
+    if _cached_mtime(target) != mtime_ns:
+        generate(source, target, mtime_ns)
+    spec = importlib.util.spec_from_file_location(target.stem, target)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return next(value for key, value in vars(module).items() if key.startswith("Ui_"))
@@ -0,0 +1,216 @@
+import functools
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from types import MappingProxyType
+from typing import NamedTuple
+
+import abilities as ab
+from codegen import stats_evaluator, StatsEvaluator, Variant, variant_evaluator
+from enums import AbilityLevel, BaseValue, Modifier, Specialization
+from model import Build
+import summarize as sm
+from tables import Key, Lookup, parse_key, parse_lookup
+import talents as tl
+
+
+# Base repair tried by the mako-base-repair layer; the real value is unknown
+MAKO_REPAIR_GUESS: float = 500.0
+
+
+class Layer(NamedTuple):
+    # An alternative reading of the game data, applied on top of the tables
+    name: str
+    description: str
+    # Talent class name -> key -> its lookup under this layer, or None to
+    # drop the key. Talents extending the class take the change too, unless
+    # they define the key themselves.
+    tables: Mapping[str, Mapping[Key, Lookup | None]] = MappingProxyType({})
+    # Abilities replaced under this layer, by title
+    abilities: Mapping[str, ab.Ability] = MappingProxyType({})
+
+
+class Results(NamedTuple):
+    # Stacks of layer names, the first usually () for the base data
+    stacks: tuple[tuple[str, ...], ...]
+    # Per build, the summaries under each stack in stacks order
+    summaries: list[tuple[tuple[str, ...], ...]]
+    builds: list[Build]
+
+
+def layer(name: str, description: str, tables: Mapping[str, Mapping[str, object]] | None = None,
+          abilities: Iterable[ab.Ability] = ()) -> Layer:
+    # tables is written as in talents.json, e.g.
+    #   {"InfiltratorOperative": {"Modifier.FIRST_AID_HASTE": None}}
+    # and checked the same way
+    parsed: dict[str, Mapping[Key, Lookup | None]] = {}
+    for ident, overrides in (tables or {}).items():
+        if not isinstance(getattr(tl, ident, None), type) or not issubclass(getattr(tl, ident), tl.Talent):
+            raise ValueError(f"{name}: unknown talent {ident!r}")
+        entries: dict[Key, Lookup | None] = {}
+        for key_text, value in overrides.items():
+            where = f"{name}.{ident}.{key_text}"
+            key = parse_key(key_text, (Modifier, BaseValue, AbilityLevel, Specialization), where)
+            entries[key] = None if value is None else MappingProxyType(parse_lookup(value, key, {}, where))
+        parsed[ident] = MappingProxyType(entries)
+    replaced = {ability.title: ability for ability in abilities}
+    unknown = replaced.keys() - {ability.title for ability in ab.catalog}
+    if unknown:
+        raise ValueError(f"{name}: unknown abilities {sorted(unknown)}")
+    return Layer(name, description, MappingProxyType(parsed), MappingProxyType(replaced))
+
+
+def _restat(ability: ab.Ability, template: str, **changes) -> ab.Ability:
+    # ability with one stat's fields changed
+    if template not in (stat.template for stat in ability.stats):
+        raise ValueError(f"{ability.title} has no stat {template!r}")
+    return ability._replace(stats=tuple(stat._replace(**changes) if stat.template == template else stat for stat in ability.stats))
+
+
+# The open questions in the data, by name
+layers: dict[str, Layer] = {
+    entry.name: entry for entry in (
+        layer(
+            "operative-haste-tech-only",
+            "Infiltrator Operative haste leaves First Aid and Neural Shock alone",
+            {"InfiltratorOperative": {"Modifier.FIRST_AID_HASTE": None, "Modifier.NEURAL_SHOCK_HASTE": None}},
+        ),
+        layer(
+            "mako-base-repair",
+            f"The Mako repairs {MAKO_REPAIR_GUESS:g} before Hull Repair bonuses",
+            abilities=[_restat(ab.MAKO, "Mako Hull Repair + {}", base=ab.constant(MAKO_REPAIR_GUESS))],
+        ),
+        layer(
+            "max-accuracy-percent",
+            "MAX_ACCURACY is a fraction, shown as a percentage like the other bonuses",
+            abilities=[_restat(ab.SHEPARD, "Max Accuracy + {}%", percent=True)],
+        ),
+    )
+}
+
+
+def _resolve(stack: Sequence[str]) -> list[Layer]:
+    unknown = [name for name in stack if name not in layers]
+    if unknown:
+        raise ValueError(f"Unknown layers {unknown}, expected some of {', '.join(layers)}")
+    return [layers[name] for name in stack]
+
+
+@functools.cache
+def talent(base: type[tl.Talent], stack: tuple[str, ...]) -> type[tl.Talent]:
+    # base under the stacked layers, later layers winning; base itself when
+    # no layer touches it, so its caches and generated code are shared
+    tables = {"modifier_table": dict(base.modifier_table), "ability_table": dict(base.ability_table)}
+    changed = False
+    for entry in _resolve(stack):
+        # From the most general class down, so a subclass's own entry wins
+        for owner in reversed(base.__mro__):
+            overrides = entry.tables.get(owner.__name__) if issubclass(owner, tl.Talent) else None
+            for key, lookup in (overrides or {}).items():
+                name = "ability_table" if isinstance(key, (AbilityLevel, Specialization)) else "modifier_table"
+                if owner is not base and getattr(base, name).get(key) != getattr(owner, name).get(key):
+                    continue
+                if lookup is None:
+                    changed |= tables[name].pop(key, None) is not None
+                else:
+                    changed |= tables[name].get(key) != lookup
+                    tables[name][key] = lookup
+    if not changed:
+        return base
+    return type(base.__name__, (base, ), {
+        "__module__": __name__,
+        "__slots__": (),
+        **{name: MappingProxyType({key: MappingProxyType(dict(lookup)) for key, lookup in table.items()})
+           for name, table in tables.items()},
+    })
+
+
+@functools.cache
+def catalog(stack: tuple[str, ...]) -> tuple[ab.Ability, ...]:
+    replaced: dict[str, ab.Ability] = {}
+    for entry in _resolve(stack):
+        replaced.update(entry.abilities)
+    return tuple(replaced.get(ability.title, ability) for ability in ab.catalog)
+
+
+def variant(talents: Sequence[type[tl.Talent]], stack: Sequence[str]) -> Variant:
+    stack = tuple(stack)
+    return tuple(talent(base, stack) for base in talents), catalog(stack)
+
+
+def evaluate(builds: Iterable[Build], stacks: Sequence[Sequence[str]]) -> Results:
+    # Summaries of every build under every stack, one call per build: each
+    # talent set gets a single generated function covering all the stacks
+    stacks = tuple(tuple(stack) for stack in stacks)
+    for stack in stacks:
+        _resolve(stack)
+    builds = list(builds)
+    evaluators = {}
+    summaries = []
+    for talents, ranks in builds:
+        evaluate_all = evaluators.get(talents)
+        if evaluate_all is None:
+            evaluate_all = evaluators[talents] = variant_evaluator(tuple(variant(talents, stack) for stack in stacks))
+        summaries.append(evaluate_all(ranks))
+    return Results(stacks, summaries, builds)
+
+
+def ranking(results: Results, stat: sm.StatKey, top: int | None = None) -> dict[tuple[str, ...], list[int]]:
+    # Stack -> build positions by the stat's unrounded value under that stack,
+    # best first; builds without it are left out
+    title, template = stat
+    if (title, template) not in {(ability.title, entry.template) for ability in ab.catalog for entry in ability.stats}:
+        raise ValueError(f"Unknown stat {stat!r}")
+    sign = -1.0 if sm.is_lower_better(stat) else 1.0
+    rankings = {}
+    for stack in results.stacks:
+        # One generated function per talent set for just this ability under the stack
+        evaluators: dict[tuple[type[tl.Talent], ...], tuple[StatsEvaluator, int]] = {}
+        values: dict[int, float] = {}
+        for position, (talents, ranks) in enumerate(results.builds):
+            pair = evaluators.get(talents)
+            if pair is None:
+                layered, layered_catalog = variant(talents, stack)
+                ability = next(ability for ability in layered_catalog if ability.title == title)
+                index = [entry.template for entry in ability.stats].index(template)
+                pair = evaluators[talents] = (stats_evaluator(layered, (ability, )), index)
+            evaluate, index = pair
+            found = evaluate(ranks)[0]
+            if found:
+                values[position] = found[index]
+        rankings[stack] = sorted(values, key=lambda position: -sign * values[position])[:top]
+    return rankings
+
+
+def changes(results: Results) -> dict[tuple[str, ...], int]:
+    # Stack -> how many builds' summaries differ from the first stack's
+    return {
+        stack: sum(summaries[index] != summaries[0] for summaries in results.summaries)
+        for index, stack in enumerate(results.stacks)
+    }
+
+
+if __name__ == "__main__":
+    import random
+    from codegen import evaluator
+    from presets import presets
+    from tables import MAX_RANK
+
+    rng = random.Random(0)
+    talent_sets = [preset.with_specialization(spec) for preset in presets.values() for spec in preset.specializations]
+    builds = [Build(talents, tuple(rng.randint(0, MAX_RANK) for _ in talents)) for talents in talent_sets for _ in range(200)]
+    stacks = [(), *((name, ) for name in layers), tuple(layers)]
+    evaluate(builds[::200], stacks)
+    start = time.perf_counter()
+    for talents, ranks in builds:
+        evaluator(talents)(ranks)
+    middle = time.perf_counter()
+    results = evaluate(builds, stacks)
+    end = time.perf_counter()
+    print(f"{len(builds)} builds: base data {(middle - start) * 1000:.0f} ms, "
+          f"{len(stacks)} stacks in one pass {(end - middle) * 1000:.0f} ms")
+    first_aid = ("First Aid", "Recharge {} sec")
+    base = ranking(results, first_aid, 10)[()]
+    for stack, count in changes(results).items():
+        moved = ranking(results, first_aid, 10)[stack] != base
+        print(f"    {' + '.join(stack) or 'base':<72} {count:5} builds changed, "
+              f"First Aid top 10 {'changed' if moved else 'same'}")
@@ -0,0 +1,82 @@
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from functools import partial, reduce
+from operator import add
+
+from enums import BaseValue, Modifier
+
+
+# Stable positions: every Modifier in definition order, then every BaseValue
+keys: tuple[Modifier | BaseValue, ...] = (*Modifier, *BaseValue)
+positions: dict[Modifier | BaseValue, int] = {key: position for position, key in enumerate(keys)}
+modifier_part = slice(0, len(Modifier))
+base_value_part = slice(len(Modifier), len(keys))
+
+_zeros = array("d", [0.0]) * len(keys)
+_sum = partial(reduce, add)
+
+
+class ModifierVector:
+
+    # One float per key, 0.0 where a talent has nothing. Element-wise work is
+    # done with map over the arrays, so there is no Python code per key.
+    __slots__ = ("values", )
+
+    def __init__(self, values: Iterable[float] | None = None):
+        self.values: array = array("d", _zeros if values is None else values)
+        if len(self.values) != len(keys):
+            raise ValueError(f"Expected {len(keys)} values, got {len(self.values)}")
+
+    @classmethod
+    def from_mapping(cls, mapping: Mapping[Modifier | BaseValue, float]) -> "ModifierVector":
+        vector = cls()
+        for key, value in mapping.items():
+            vector.values[positions[key]] = value
+        return vector
+
+    def copy(self) -> "ModifierVector":
+        return ModifierVector(self.values)
+
+    def add(self, other: "ModifierVector", part: slice = slice(None)) -> "ModifierVector":
+        self.values[part] = array("d", map(add, self.values[part], other.values[part]))
+        return self
+
+    def max(self, other: "ModifierVector", part: slice = slice(None)) -> "ModifierVector":
+        self.values[part] = array("d", map(max, self.values[part], other.values[part]))
+        return self
+
+    def aggregate(self, other: "ModifierVector") -> "ModifierVector":
+        # How talents combine: modifiers are summed, base values take the highest
+        self.add(other, modifier_part)
+        return self.max(other, base_value_part)
+
+    @classmethod
+    def total(cls, vectors: Iterable["ModifierVector"]) -> "ModifierVector":
+        # The same as aggregating each vector into zeros in turn, but a whole
+        # column at a time. Sums still add in order, so results are identical.
+        columns = list(zip(_zeros, *(vector.values for vector in vectors)))
+        values = array("d", map(_sum, columns[modifier_part]))
+        values.extend(map(max, columns[base_value_part]))
+        return cls(values)
+
+    def project(self, selected: Sequence[int]) -> tuple[float, ...]:
+        return tuple(self.values[position] for position in selected)
+
+    # Read like the dicts talents return, so summarizers work unchanged. Every
+    # Modifier and BaseValue is present (0.0 when unset); default is for keys
+    # with no position, such as ability levels.
+    def get(self, key: object, default: float = 0.0) -> float:
+        position = positions.get(key)
+        return default if position is None else self.values[position]
+
+    def __getitem__(self, key: Modifier | BaseValue) -> float:
+        return self.values[positions[key]]
+
+    def items(self) -> Iterator[tuple[Modifier | BaseValue, float]]:
+        return zip(keys, self.values)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ModifierVector) and self.values == other.values
+
+    def __repr__(self) -> str:
+        return f"ModifierVector({ {key.name: value for key, value in self.items() if value} })"
@@ -0,0 +1,300 @@
+import math
+import time
+from array import array
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from itertools import repeat
+from operator import mul
+from typing import NamedTuple
+
+import abilities as ab
+from codegen import stats_evaluator, StatsEvaluator
+from index import ability_keys, Key, projection
+from model import Build
+import summarize as sm
+import talents as tl
+
+
+# Seconds of fire burst DPS is measured over, from a cold weapon; the length
+# of Marksman, Overkill, Carnage and Assassination
+BURST_SECONDS: float = 6.0
+
+
+class Weapon(NamedTuple):
+    name: str
+    # Title of the ability its bonuses come from, e.g. "Assault Rifles"
+    family: str
+    manufacturer: str
+    tier: int
+    damage: float
+    # Shots per second
+    rate: float
+    # Share of the heat capacity a shot adds; the weapon locks until cool when it fills
+    heat: float
+    # Share of the heat capacity lost per second
+    cooling: float
+    # Chance to hit before accuracy bonuses
+    accuracy: float
+
+
+class Bonuses(NamedTuple):
+    # What a build does to one family's weapons, with and without the
+    # family's power active
+    damage: float
+    accuracy: float
+    heat: float
+    power_damage: float
+    power_accuracy: float
+    power_heat: float
+    # Share of the time the power is active, sustained and over a burst
+    uptime: float
+    burst_uptime: float
+
+
+class Table(NamedTuple):
+    weapons: tuple[Weapon, ...]
+    # One row per build, one value per weapon
+    sustained: list[array]
+    burst: list[array]
+
+
+families: tuple[str, ...] = ("Pistol", "Assault Rifles", "Shotgun", "Sniper Rifles")
+# The power that boosts each family's weapons while active
+family_powers: dict[str, ab.Ability] = {
+    "Pistol": ab.MARKSMAN,
+    "Assault Rifles": ab.OVERKILL,
+    "Shotgun": ab.CARNAGE,
+    "Sniper Rifles": ab.ASSASSINATION,
+}
+_family_abilities: dict[str, ab.Ability] = {ability.title: ability for ability in ab.catalog if ability.title in families}
+
+# Tier I numbers of each manufacturer's line; approximate, like the enemies'.
+# Higher tiers hit harder and run cooler.
+_lines: dict[str, tuple[tuple[str, float, float, float, float, float], ...]] = {
+    # manufacturer, damage, rate, heat, cooling, accuracy
+    "Pistol": (
+        ("Elkoss Combine", 40.0, 2.0, 0.10, 0.35, 0.65),
+        ("Hahne-Kedar", 48.0, 1.8, 0.12, 0.35, 0.60),
+        ("Kassa Fabrication", 55.0, 1.5, 0.12, 0.30, 0.70),
+        ("Haliat Armory", 44.0, 2.2, 0.13, 0.40, 0.55),
+        ("Armax Arsenal", 60.0, 1.6, 0.15, 0.35, 0.65),
+    ),
+    "Assault Rifles": (
+        ("Elkoss Combine", 16.0, 8.0, 0.030, 0.25, 0.50),
+        ("Hahne-Kedar", 18.0, 7.5, 0.035, 0.25, 0.50),
+        ("Kassa Fabrication", 20.0, 6.5, 0.035, 0.22, 0.55),
+        ("Haliat Armory", 17.0, 9.0, 0.040, 0.30, 0.45),
+        ("Armax Arsenal", 22.0, 7.0, 0.045, 0.28, 0.50),
+    ),
+    "Shotgun": (
+        ("Elkoss Combine", 110.0, 1.0, 0.20, 0.30, 0.75),
+        ("Hahne-Kedar", 125.0, 0.9, 0.22, 0.30, 0.70),
+        ("Kassa Fabrication", 140.0, 0.8, 0.22, 0.28, 0.75),
+        ("Haliat Armory", 115.0, 1.1, 0.25, 0.35, 0.65),
+        ("Armax Arsenal", 150.0, 0.8, 0.25, 0.30, 0.70),
+    ),
+    "Sniper Rifles": (
+        ("Elkoss Combine", 220.0, 0.6, 0.35, 0.25, 0.40),
+        ("Hahne-Kedar", 250.0, 0.5, 0.35, 0.22, 0.45),
+        ("Kassa Fabrication", 280.0, 0.45, 0.40, 0.22, 0.45),
+        ("Haliat Armory", 230.0, 0.65, 0.40, 0.28, 0.35),
+        ("Armax Arsenal", 300.0, 0.45, 0.45, 0.25, 0.40),
+    ),
+}
+_roman: tuple[str, ...] = ("I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X")
+
+catalog: tuple[Weapon, ...] = tuple(
+    Weapon(f"{manufacturer} {family} {numeral}", family, manufacturer, tier,
+           damage * (1.0 + 0.12 * (tier - 1)), rate, heat * (1.0 - 0.04 * (tier - 1)), cooling, accuracy)
+    for family in families
+    for manufacturer, damage, rate, heat, cooling, accuracy in _lines[family]
+    for tier, numeral in enumerate(_roman, 1)
+)
+
+
+# The abilities bonuses read, and the keys their summaries depend on
+_abilities: tuple[ab.Ability, ...] = tuple(ability for family in families for ability in (_family_abilities[family], family_powers[family]))
+_keys: frozenset[Key] = ability_keys(_abilities)
+_templates: tuple[tuple[str, ...], ...] = tuple(tuple(stat.template for stat in ability.stats) for ability in _abilities)
+
+
+def bonuses(values: Mapping[str, Mapping[str, float]]) -> tuple[Bonuses, ...]:
+    # values: title -> summarize.calculate_ability's result, for at least each
+    # family and its power. One per family, in families order.
+    result = []
+    for family in families:
+        stats, power = values[family], values[family_powers[family].title]
+        damage = 1.0 + stats.get("Damage + {}%", 0.0)
+        accuracy = 1.0 + stats.get("Accuracy + {}%", 0.0)
+        # Cooling bonuses cut the heat each shot adds
+        heat = 1.0 / (1.0 + stats.get("Cooling + {}%", 0.0))
+        if not power:
+            result.append(Bonuses(damage, accuracy, heat, damage, accuracy, heat, 0.0, 0.0))
+            continue
+        # As in rotation, "Damage {}% DPS" adds to the weapon's multiplier while active
+        duration = power["Duration {} sec"]
+        result.append(Bonuses(
+            damage, accuracy, heat,
+            damage + power.get("Damage + {}%", 0.0) + power.get("Damage {}% DPS", 0.0),
+            accuracy + power.get("Accuracy + {}%", 0.0),
+            heat * (1.0 - power.get("Cooling {}%", 0.0)),
+            min(1.0, duration / power["Recharge {} sec"]),
+            min(1.0, duration / BURST_SECONDS),
+        ))
+    return tuple(result)
+
+
+def build_bonuses(builds: Iterable[Build]) -> list[tuple[Bonuses, ...]]:
+    # One per build. As with enemies.profiles, builds are reduced to the ranks
+    # of the talents that feed the families and their powers, and each
+    # distinct reduction is computed once with a generated function.
+    evaluators: dict[tuple[type[tl.Talent], ...], tuple[Callable[[Sequence[int]], tuple[int, ...]], StatsEvaluator]] = {}
+    found: dict[tuple, tuple[Bonuses, ...]] = {}
+    result = []
+    for talents, ranks in builds:
+        pair = evaluators.get(talents)
+        if pair is None:
+            pair = evaluators[talents] = (projection(talents, _keys), stats_evaluator(talents, _abilities))
+        project, evaluate = pair
+        key = (talents, project(ranks))
+        built = found.get(key)
+        if built is None:
+            built = found[key] = bonuses({
+                ability.title: dict(zip(templates, stats)) for ability, templates, stats in zip(_abilities, _templates, evaluate(ranks))
+            })
+        result.append(built)
+    return result
+
+
+class _Columns(NamedTuple):
+    # Some weapons as one array per field, for the passes over all of them
+    damage: array
+    rate: array
+    heat: array
+    cooling: array
+    accuracy: array
+
+
+def _columns(weapons: Sequence[Weapon]) -> _Columns:
+    return _Columns(*(array("d", (getattr(weapon, field) for weapon in weapons)) for field in _Columns._fields))
+
+
+def sustained_rate(rate: float, heat: float, cooling: float) -> float:
+    # Shots per second over a long fight: a weapon that heats faster than it
+    # cools spends the share cooling / (heat * rate) of its time firing,
+    # counting the lockouts.
+    shot_heat = heat * rate
+    return rate if shot_heat <= cooling else cooling / heat
+
+
+def _burst_rate(rate: float, heat: float, cooling: float) -> float:
+    # Shots per second over BURST_SECONDS from cold: full rate until the first
+    # overheat, then the sustained rate
+    net = heat * rate - cooling
+    if net <= 0 or 1.0 / net >= BURST_SECONDS:
+        return rate
+    until = 1.0 / net
+    return (rate * until + (BURST_SECONDS - until) * cooling / heat) / BURST_SECONDS
+
+
+def _phase(columns: _Columns, accuracy: float, heat: float) -> tuple[array, array]:
+    # Sustained and burst DPS of each weapon per unit of damage multiplier,
+    # at one accuracy multiplier and heat factor; a field at a time
+    count = len(columns.damage)
+    hit = map(min, repeat(1.0, count), map(mul, columns.accuracy, repeat(accuracy, count)))
+    per_shot = array("d", map(mul, columns.damage, hit))
+    heats = array("d", map(mul, columns.heat, repeat(heat, count)))
+    return (
+        array("d", map(mul, per_shot, map(sustained_rate, columns.rate, heats, columns.cooling))),
+        array("d", map(mul, per_shot, map(_burst_rate, columns.rate, heats, columns.cooling))),
+    )
+
+
+def _mix(plain: array, boosted: array, plain_scale: float, boosted_scale: float) -> array:
+    if not boosted_scale:
+        return array("d", [value * plain_scale for value in plain])
+    return array("d", [value * plain_scale + other * boosted_scale for value, other in zip(plain, boosted)])
+
+
+def table_from_bonuses(build_bonuses: Sequence[tuple[Bonuses, ...]], weapons: Sequence[Weapon] = catalog) -> Table:
+    # A weapon's DPS in one phase is the damage multiplier times a value that
+    # only depends on its family's accuracy and heat bonuses, and few of those
+    # occur. Each is computed once over the family's weapons; a build's row is
+    # then its phases scaled by damage and uptime, each phase at its own heat
+    # (heat carried between them is ignored). Builds with the same bonuses
+    # share their rows, and builds with the same bonuses for a family share
+    # that family's part.
+    order = sorted(range(len(weapons)), key=lambda position: families.index(weapons[position].family))
+    grouped = [weapons[position] for position in order]
+    # Where each weapon's value lands in a row of the grouped weapons
+    placed = None if order == sorted(order) else array("l", sorted(range(len(order)), key=order.__getitem__))
+    family_columns = [_columns([weapon for weapon in grouped if weapon.family == family]) for family in families]
+    phases: dict[tuple[int, float, float], tuple[array, array]] = {}
+    parts: dict[tuple[int, Bonuses], tuple[array, array]] = {}
+
+    def phase(index: int, accuracy: float, heat: float) -> tuple[array, array]:
+        found = phases.get((index, accuracy, heat))
+        if found is None:
+            found = phases[index, accuracy, heat] = _phase(family_columns[index], accuracy, heat)
+        return found
+
+    def part(index: int, b: Bonuses) -> tuple[array, array]:
+        found = parts.get((index, b))
+        if found is None:
+            plain, boosted = phase(index, b.accuracy, b.heat), phase(index, b.power_accuracy, b.power_heat)
+            found = parts[index, b] = (
+                _mix(plain[0], boosted[0], (1.0 - b.uptime) * b.damage, b.uptime * b.power_damage),
+                _mix(plain[1], boosted[1], (1.0 - b.burst_uptime) * b.damage, b.burst_uptime * b.power_damage),
+            )
+        return found
+
+    def row(build: tuple[Bonuses, ...]) -> tuple[array, array]:
+        sustained, burst = array("d"), array("d")
+        for index, b in enumerate(build):
+            family_sustained, family_burst = part(index, b)
+            sustained += family_sustained
+            burst += family_burst
+        if placed is not None:
+            sustained, burst = array("d", map(sustained.__getitem__, placed)), array("d", map(burst.__getitem__, placed))
+        return sustained, burst
+
+    unique: dict[tuple[Bonuses, ...], int] = {}
+    positions = [unique.setdefault(b, len(unique)) for b in build_bonuses]
+    rows = [row(b) for b in unique]
+    return Table(tuple(weapons), [rows[position][0] for position in positions], [rows[position][1] for position in positions])
+
+
+def table(builds: Iterable[Build], weapons: Sequence[Weapon] = catalog) -> Table:
+    # Sustained and burst DPS of every weapon in the hands of each build
+    return table_from_bonuses(build_bonuses(builds), weapons)
+
+
+def best(dps: Sequence[float], weapons: Sequence[Weapon] = catalog) -> dict[str, Weapon]:
+    # Family -> its weapon with the highest value in a table row
+    result: dict[str, tuple[float, Weapon]] = {}
+    for value, weapon in zip(dps, weapons):
+        if value > result.get(weapon.family, (-math.inf, None))[0]:
+            result[weapon.family] = (value, weapon)
+    return {family: weapon for family, (value, weapon) in result.items()}
+
+
+if __name__ == "__main__":
+    import random
+    from presets import presets
+    from tables import MAX_RANK
+
+    rng = random.Random(0)
+    talent_sets = [preset.with_specialization(spec) for preset in presets.values() for spec in preset.specializations]
+    builds = [Build(talents, tuple(rng.randint(0, MAX_RANK) for _ in talents)) for talents in talent_sets for _ in range(200)]
+    start = time.perf_counter()
+    bonuses_per_build = build_bonuses(builds)
+    middle = time.perf_counter()
+    result = table_from_bonuses(bonuses_per_build)
+    end = time.perf_counter()
+    print(f"{len(builds)} builds: bonuses {(middle - start) * 1000:.0f} ms, "
+          f"{len(builds)} x {len(catalog)} table {(end - middle) * 1000:.0f} ms, "
+          f"{len(set(bonuses_per_build))} distinct")
+    row = next(index for index, build in enumerate(builds) if build.talents[-4].__name__ == "SoldierCommando")
+    for family, weapon in best(result.sustained[row]).items():
+        index = catalog.index(weapon)
+        print(f"    {weapon.name:<36} sustained {sm.truncate(result.sustained[row][index]):>8}  "
+              f"burst {sm.truncate(result.burst[row][index])}")
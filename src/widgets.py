@@ -1,8 +1,9 @@
-import bisect
-import itertools
+import functools
+from collections import deque
+from collections.abc import Iterable
 
-from PyQt5.QtCore import pyqtSignal, pyqtSlot, QSize
-from PyQt5.QtGui import QFont
+from PyQt5.QtCore import pyqtSignal, pyqtSlot, QObject, QRect, QSize, Qt, QTimer
+from PyQt5.QtGui import QBrush, QColor, QFont, QPainter
 from PyQt5.QtWidgets import (
     QComboBox,
     QHBoxLayout,
@@ -11,51 +12,102 @@ from PyQt5.QtWidgets import (
     QSizePolicy,
     QSpacerItem,
     QSpinBox,
+    QTableWidget,
+    QTableWidgetItem,
     QVBoxLayout,
     QWidget,
 )
 
+from codegen import evaluator
+from index import title_index
+import marginal
+from model import Build, ModelEvent, TreeModel
+from presets import Preset, presets
+from summarize import display_value, stat_name
 import talents as tl
 
 
-class TalentPoint(QLabel):
+class RankBar(QWidget):
+
+    rankClicked = pyqtSignal(int)
+
+    pip_count: int = 12
+    pip_size: QSize = QSize(19, 25)
+    pip_spacing: int = 2
 
     def __init__(self, parent=None):
         super().__init__(parent)
         sizePolicy1 = QSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
         sizePolicy1.setHorizontalStretch(0)
         sizePolicy1.setVerticalStretch(0)
-        sizePolicy1.setHeightForWidth(self.sizePolicy().hasHeightForWidth())
         self.setSizePolicy(sizePolicy1)
-        self.setMinimumSize(QSize(19, 25))
-        self.setStyleSheet("border: 1px solid black;")
-
-    def set_on(self):
-        self.setStyleSheet("background-color: rgb(0, 255, 0); border: 1px solid black;")
-
-    def set_off(self):
-        self.setStyleSheet("border: 1px solid black;")
+        self.setMinimumSize(self.sizeHint())
+        self._rank: int = 0
+        self._thresholds: frozenset[int] = frozenset()
+
+    def sizeHint(self) -> QSize:
+        width = self.pip_count * self.pip_size.width() + (self.pip_count - 1) * self.pip_spacing
+        return QSize(width, self.pip_size.height())
+
+    def set_rank(self, rank: int):
+        if rank != self._rank:
+            self._rank = rank
+            self.update()
+
+    def set_thresholds(self, thresholds: Iterable[int]):
+        self._thresholds = frozenset(thresholds)
+        self.update()
+
+    def pip_rect(self, index: int) -> QRect:
+        x = index * (self.pip_size.width() + self.pip_spacing)
+        return QRect(x, 0, self.pip_size.width() - 1, self.pip_size.height() - 1)
+
+    def pip_at(self, x: int) -> int:
+        # 1-indexed rank of the pip under x, or 0 if between/outside pips
+        index, offset = divmod(x, self.pip_size.width() + self.pip_spacing)
+        if 0 <= index < self.pip_count and offset < self.pip_size.width():
+            return index + 1
+        return 0
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setPen(QColor(0, 0, 0))
+        for i in range(self.pip_count):
+            rect = self.pip_rect(i)
+            if i < self._rank:
+                painter.fillRect(rect, QColor(0, 255, 0))
+            painter.drawRect(rect)
+        # Mark the ranks set_thresholds was given
+        painter.setPen(QColor(255, 0, 0))
+        for rank in self._thresholds:
+            rect = self.pip_rect(rank - 1)
+            painter.drawLine(rect.left() + 1, rect.bottom() - 2, rect.right() - 1, rect.bottom() - 2)
+        painter.end()
+
+    def mousePressEvent(self, event):
+        if event.button() != Qt.LeftButton:
+            return super().mousePressEvent(event)
+        rank = self.pip_at(event.pos().x())
+        if rank:
+            # Clicking the highest filled pip clears it
+            self.rankClicked.emit(rank - 1 if rank == self._rank else rank)
 
 
 class TalentBar(QWidget):
 
-    rankChanged = pyqtSignal()
+    rankRequested = pyqtSignal(int)
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setupUi()
-        self.talent = tl.Talent(0)
+        self.talent: type[tl.Talent] = tl.Talent
+        self.rank: int = 0
         self._max_rank: int = 2
+        # Mark every rank where the talent's tables change value, not only
+        # where it unlocks an ability level or specialization
+        self._mark_breakpoints: bool = False
         self._update_buttons()
 
-    @property
-    def rank(self) -> int:
-        return self.talent.rank
-
-    @rank.setter
-    def rank(self, rank: int):
-        self.talent.rank = rank
-
     def setupUi(self):
         self.resize(431, 47)
         self.horizontalLayout = QHBoxLayout(self)
@@ -72,18 +124,14 @@ class TalentBar(QWidget):
 
         self.horizontalLayout.addWidget(self.nameLabel)
 
-        self.tpLayout = QHBoxLayout()
-        self.tpLayout.setSpacing(2)
-        self.tps = tuple([TalentPoint(self) for _ in range(12)])
-        for tp in self.tps:
-            self.tpLayout.addWidget(tp)
+        self.rankBar = RankBar(self)
+
+        self.horizontalLayout.addWidget(self.rankBar)
 
         sizePolicy1 = QSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
         sizePolicy1.setHorizontalStretch(0)
         sizePolicy1.setVerticalStretch(0)
 
-        self.horizontalLayout.addLayout(self.tpLayout)
-
         self.buttonLayout = QHBoxLayout()
         self.buttonLayout.setSpacing(2)
         self.decrementButton = QPushButton(self)
@@ -107,61 +155,145 @@ class TalentBar(QWidget):
         self.horizontalLayout.addLayout(self.buttonLayout)
 
         self.nameLabel.setText("<TALENT>")
-        for tp in self.tps:
-            tp.setText("")
         self.decrementButton.setText("-")
         self.incrementButton.setText("+")
 
         self.incrementButton.clicked.connect(self.increment_clicked)
         self.decrementButton.clicked.connect(self.decrement_clicked)
+        self.rankBar.rankClicked.connect(self.rankBar_clicked)
 
     @pyqtSlot()
     def increment_clicked(self):
-        self.rank += 1
-        self.display_rank()
-        self._update_buttons()
-        self.rankChanged.emit()
+        self.rankRequested.emit(self.rank + 1)
 
     @pyqtSlot()
     def decrement_clicked(self):
-        self.rank -= 1
-        self.display_rank()
-        self._update_buttons()
-        self.rankChanged.emit()
+        self.rankRequested.emit(self.rank - 1)
 
-    def display_rank(self):
-        for i, tp in enumerate(self.tps, start=1):
-            if i <= self.rank:
-                tp.set_on()
-            else:
-                tp.set_off()
+    @pyqtSlot(int)
+    def rankBar_clicked(self, rank: int):
+        rank = min(rank, self._max_rank)
+        if rank != self.rank:
+            self.rankRequested.emit(rank)
+
+    def set_rank(self, rank: int):
+        self.rank = rank
+        self.rankBar.set_rank(rank)
+        self._update_buttons()
 
     def _update_buttons(self):
         self.decrementButton.setEnabled(self.rank != 0)
-        self.incrementButton.setEnabled(self.rank != self._max_rank)
+        self.incrementButton.setEnabled(self.rank < self._max_rank)
 
     def set_max_rank(self, rank: int):
         self._max_rank = rank
         self._update_buttons()
-    
-    def set_talent(self, talent: tl.Talent):
-        assert talent.rank == 0
+
+    def set_highlighted(self, highlighted: bool):
+        font = self.nameLabel.font()
+        font.setBold(highlighted)
+        self.nameLabel.setFont(font)
+
+    def set_talent(self, talent: type[tl.Talent]):
         self.talent = talent
         self.nameLabel.setText(talent.name)
+        self._update_thresholds()
+
+    def set_mark_breakpoints(self, enabled: bool):
+        self._mark_breakpoints = enabled
+        self._update_thresholds()
 
+    def _update_thresholds(self):
+        if self._mark_breakpoints:
+            self.rankBar.set_thresholds(self.talent.breakpoint_ranks())
+        else:
+            self.rankBar.set_thresholds(self.talent.unlock_ranks())
 
-# 1-5: 3 points per level
-# 6-35: 2 points per level
-# 36-60: 1 point per level
-point_totals: list[int] = list(itertools.accumulate([3]*5 + [2]*30 + [1]*25))
-lvl_to_pts: dict[int, int] = dict(enumerate(point_totals, start=1))
-pts_to_lvl: dict[int, int] = {pts: lvl for lvl, pts in lvl_to_pts.items()}
+
+class Speculator(QObject):
+
+    # Summaries for the model's current ranks
+    summariesChanged = pyqtSignal(list)
+    # Talent index, what one more point in it changes
+    previewReady = pyqtSignal(int, str)
+
+    def __init__(self, model: TreeModel, parent=None):
+        super().__init__(parent)
+        self.model = model
+        # Ranks -> the output of each summarizer, for the current ranks and
+        # their +/-1 neighbours
+        self.cache: dict[tuple[int, ...], tuple[str, ...]] = {}
+        self.queue: deque[tuple[int, int]] = deque()
+        # Zero-interval timer, so one candidate is computed per idle pass of
+        # the event loop and user input is never kept waiting
+        self.timer = QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.timer_timeout)
+        self.model.subscribe(self.model_changed)
+
+    def current(self) -> tuple[str, ...]:
+        ranks = self.model.ranks
+        if ranks not in self.cache:
+            self.cache[ranks] = evaluator(self.model.talents)(ranks)
+        return self.cache[ranks]
+
+    def model_changed(self, event: ModelEvent, index: int | None):
+        if event is ModelEvent.PRESET:
+            self.cache.clear()
+        ranks = self.model.ranks
+        current = self.current()
+        # Keep only the new ranks' neighbours, which may already be computed
+        neighbours = {ranks[:i] + (ranks[i] + step, ) + ranks[i + 1:] for i in range(len(ranks)) for step in (1, -1)}
+        self.cache = {key: value for key, value in self.cache.items() if key in neighbours or key == ranks}
+        self.queue.clear()
+        for i, rank in enumerate(ranks):
+            self.queue.append((i, rank + 1))
+            self.queue.append((i, rank - 1))
+        self.timer.start()
+        if event is not ModelEvent.LEVEL:
+            self.summariesChanged.emit([summary for summary in current if summary])
+
+    @pyqtSlot()
+    def timer_timeout(self):
+        if not self.queue:
+            self.timer.stop()
+            return
+        index, rank = self.queue.popleft()
+        if not 0 <= rank <= self.model.max_rank(index):
+            return
+        ranks = self.model.ranks
+        key = ranks[:index] + (rank, ) + ranks[index + 1:]
+        if key not in self.cache:
+            self.cache[key] = evaluator(self.model.talents)(key)
+        if rank > ranks[index]:
+            self.previewReady.emit(index, self.preview(key))
+
+    def preview(self, ranks: tuple[int, ...]) -> str:
+        current = set(self.current())
+        changed = [summary for summary in self.cache[ranks] if summary and summary not in current]
+        return "\n".join(["Next point:"] + changed) if changed else "Next point: no change"
 
 
 class TalentTree(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.bars: list[TalentBar] = []
+        self.preset: Preset | None = None
+        # See TalentBar.set_mark_breakpoints
+        self.mark_breakpoints: bool = False
+        # Class name -> (specialization index, ranks, level)
+        self.class_states: dict[str, tuple[int, tuple[int, ...], int]] = {}
+        self.model = TreeModel()
+        self.model.subscribe(self.model_changed)
+        self.speculator = Speculator(self.model, self)
+        self.speculator.previewReady.connect(self.speculator_previewReady)
+        # The recommendation runs a full marginal.analyze, so it waits until
+        # rank changes (key autorepeat included) have paused
+        self.recommendTimer = QTimer(self)
+        self.recommendTimer.setSingleShot(True)
+        self.recommendTimer.setInterval(150)
+        self.recommendTimer.timeout.connect(self.recommendTimer_timeout)
         self.setupUi()
 
     def setupUi(self):
@@ -194,6 +326,16 @@ class TalentTree(QWidget):
 
         self.horizontalLayout_2.addWidget(self.classCombo)
 
+        self.specStaticLabel = QLabel(self)
+        self.specStaticLabel.setObjectName("specStaticLabel")
+
+        self.horizontalLayout_2.addWidget(self.specStaticLabel)
+
+        self.specCombo = QComboBox(self)
+        self.specCombo.setObjectName("specCombo")
+
+        self.horizontalLayout_2.addWidget(self.specCombo)
+
         self.horizontalSpacer = QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum)
 
         self.horizontalLayout_2.addItem(self.horizontalSpacer)
@@ -258,6 +400,10 @@ class TalentTree(QWidget):
 
         self.horizontalLayout.addWidget(self.unallocatedPointLabel)
 
+        self.recommendLabel = QLabel(self)
+        self.recommendLabel.setObjectName("recommendLabel")
+
+        self.verticalLayout.addWidget(self.recommendLabel)
 
         self.verticalLayout.addLayout(self.horizontalLayout)
 
@@ -268,122 +414,187 @@ class TalentTree(QWidget):
         self.classCombo.setItemText(3, "Infiltrator")
         self.classCombo.setItemText(4, "Vanguard")
         self.classCombo.setItemText(5, "Sentinel")
+        self.specStaticLabel.setText("Specialization:")
 
         self.levelStaticLabel.setText("Level:")
         self.tpStaticLabel.setText("Total Points:")
         self.totalPointLabel.setText("3")
         self.unallocStaticLabel.setText("Unallocated Points:")
         self.unallocatedPointLabel.setText("3")
+        self.recommendLabel.setText("")
 
-        self.levelSpin.valueChanged.connect(self.levelSpin_valueChanged)        
-    
-    def add_talent_bar(self, talent: tl.Talent):
-        num_bars = len(self.findChildren(TalentBar))
+        self.levelSpin.valueChanged.connect(self.levelSpin_valueChanged)
+        self.classCombo.currentTextChanged.connect(self.classCombo_currentTextChanged)
+        self.specCombo.currentIndexChanged.connect(self.specCombo_currentIndexChanged)
+
+    def add_talent_bar(self):
+        index = len(self.bars)
         bar = TalentBar(self)
-        bar.setObjectName(f"talentbar_{num_bars + 1}")
-        bar.set_talent(talent)
-        bar.rankChanged.connect(self.talent_bars_rankChanged)
-        self.verticalLayout.insertWidget(num_bars + 1, bar)
-    
-    def delete_all_talent_bars(self):
-        for bar in self.findChildren(TalentBar):
-            self.verticalLayout.removeWidget(bar)
-            bar.deleteLater()
-        self.levelSpin.setValue(1)
-
-    @property
-    def total_points(self) -> int:
-        return lvl_to_pts[self.levelSpin.value()]
-
-    @property
-    def allocated_points(self) -> int:
-        return sum(bar.rank for bar in self.findChildren(TalentBar))
-
-    @property
-    def unallocated_points(self) -> int:
-        return self.total_points - self.allocated_points
+        bar.setObjectName(f"talentbar_{index + 1}")
+        bar.rankRequested.connect(functools.partial(self.talent_bar_rankRequested, index))
+        bar.set_mark_breakpoints(self.mark_breakpoints)
+        self.verticalLayout.insertWidget(index + 1, bar)
+        self.bars.append(bar)
+
+    def bind_talent_bars(self):
+        # Bars are never deleted; ones past the current class's talents are
+        # hidden and rebound on the next switch.
+        talents = self.model.talents
+        while len(self.bars) < len(talents):
+            self.add_talent_bar()
+        for index, bar in enumerate(self.bars):
+            if index < len(talents):
+                bar.set_talent(talents[index])
+                bar.set_rank(self.model.ranks[index])
+                bar.show()
+            else:
+                bar.hide()
 
     def update_total_point_display(self):
-        self.totalPointLabel.setText(str(self.total_points))
+        self.totalPointLabel.setText(str(self.model.total_points))
 
     def update_unallocated_point_display(self):
-        self.unallocatedPointLabel.setText(str(self.unallocated_points))
+        self.unallocatedPointLabel.setText(str(self.model.unallocated_points))
+
+    def update_recommendation_display(self):
+        best = marginal.recommend(self.model)
+        if best is None:
+            self.recommendLabel.setText("")
+            return
+        text = f"Best next point: {best.talent.name} (rank {best.rank})"
+        if (next_level := marginal.level_up(self.model)) and next_level.unlocks:
+            unlocked = ", ".join(f"{self.model.talents[i].name} {rank}" for i, rank in next_level.unlocks)
+            text += f"\nLevel {next_level.level} unlocks: {unlocked}"
+        self.recommendLabel.setText(text)
+
+    def set_mark_breakpoints(self, enabled: bool):
+        self.mark_breakpoints = enabled
+        for bar in self.bars:
+            bar.set_mark_breakpoints(enabled)
 
     def update_TalentBar_max_ranks(self):
-        for bar in self.findChildren(TalentBar):
-            # Lowest of: 12, level + 1, talent rank + remaining points
-            rank = min((12, self.levelSpin.value() + 1, bar.rank + self.unallocated_points))
-            bar.set_max_rank(rank)
+        for index, bar in enumerate(self.bars):
+            bar.set_max_rank(self.model.max_rank(index))
+
+    def update_levelSpin(self):
+        self.levelSpin.blockSignals(True)
+        self.levelSpin.setMinimum(self.model.min_level)
+        self.levelSpin.setValue(self.model.level)
+        self.levelSpin.blockSignals(False)
 
     @pyqtSlot(int)
-    def levelSpin_valueChanged(self, _):
-        self.update_TalentBar_max_ranks()
-        self.update_unallocated_point_display()
-        self.update_total_point_display()
+    def levelSpin_valueChanged(self, level: int):
+        self.model.set_level(level)
 
     @pyqtSlot()
-    def talent_bars_rankChanged(self):
-        self.update_levelSpin_min()
+    def recommendTimer_timeout(self):
+        self.update_recommendation_display()
+
+    @pyqtSlot(int, str)
+    def speculator_previewReady(self, index: int, preview: str):
+        self.bars[index].setToolTip(preview)
+
+    def talent_bar_rankRequested(self, index: int, rank: int):
+        self.model.set_rank(index, rank)
+
+    def model_changed(self, event: ModelEvent, index: int | None):
+        if event is ModelEvent.PRESET:
+            self.setUpdatesEnabled(False)
+            self.bind_talent_bars()
+            self.setUpdatesEnabled(True)
+        elif event is ModelEvent.RANK:
+            self.bars[index].set_rank(self.model.ranks[index])
+        for bar in self.bars:
+            bar.setToolTip("")
+        self.update_levelSpin()
         self.update_TalentBar_max_ranks()
         self.update_unallocated_point_display()
         self.update_total_point_display()
+        self.recommendTimer.start()
+
+    @pyqtSlot(str)
+    def classCombo_currentTextChanged(self, name: str):
+        self.set_class(name)
+
+    @pyqtSlot(int)
+    def specCombo_currentIndexChanged(self, index: int):
+        if self.preset is None or index < 0:
+            return
+        spec = self.preset.specializations[index]
+        self.model.set_preset(self.preset.with_specialization(spec), self.model.ranks, self.model.level)
+
+    def save_class_state(self):
+        if self.preset is not None:
+            self.class_states[self.preset.name] = (self.specCombo.currentIndex(), self.model.ranks, self.model.level)
+
+    def set_class(self, name: str):
+        self.save_class_state()
+        self.preset = presets[name]
+        spec_index, ranks, level = self.class_states.get(name, (0, None, self.model.level))
+
+        self.specCombo.blockSignals(True)
+        self.specCombo.clear()
+        self.specCombo.addItems([spec.name for spec in self.preset.specializations])
+        self.specCombo.setCurrentIndex(spec_index)
+        self.specCombo.blockSignals(False)
+
+        self.classCombo.blockSignals(True)
+        self.classCombo.setCurrentText(name)
+        self.classCombo.blockSignals(False)
+
+        spec = self.preset.specializations[spec_index]
+        self.model.set_preset(self.preset.with_specialization(spec), ranks, level)
+
+    def highlight_summary(self, title: str | None):
+        # Bold the talents that can change the named summary; None clears
+        talents = title_index.get(title, frozenset()) if title else frozenset()
+        for bar in self.bars:
+            bar.set_highlighted(bar.talent in talents)
+
+    def build_name(self) -> str:
+        return f"{self.specCombo.currentText()} L{self.model.level}"
 
-    def update_levelSpin_min(self):
-        # 1) Make sure there's at least as many total points as allocated
-        zero_indexed_level = bisect.bisect_left(point_totals, self.allocated_points)
-        min_lvl_by_total = zero_indexed_level + 1
-        # 2) Make sure ranks are not greater than level + 1
-        highest_rank = max([bar.rank for bar in self.findChildren(TalentBar)])
-        min_lvl_by_rank = highest_rank - 1
-        # Use high
-        min_level = max((min_lvl_by_total, min_lvl_by_rank))
-        self.levelSpin.setMinimum(min_level)
-
-    def set_class_soldier(self):
-        self.delete_all_talent_bars()
-        self.add_talent_bar(tl.Pistols(0))
-        # self.add_talent_bar(tl.AssaultRifles(0))
-        self.add_talent_bar(tl.Shotguns(0))
-        # self.add_talent_bar(tl.SniperRifles(0))
-        self.add_talent_bar(tl.AssaultTraining(0))
-        # self.add_talent_bar(tl.Fitness(0))
-        # self.add_talent_bar(tl.BasicArmor(0))
-        # self.add_talent_bar(tl.CombatArmor(0))
-        # self.add_talent_bar(tl.TacticalArmor(0))
-        # self.add_talent_bar(tl.FirstAid(0))
-        # self.add_talent_bar(tl.Adept(0))
-        # self.add_talent_bar(tl.AdeptBastion(0))
-        # self.add_talent_bar(tl.AdeptNemesis(0))
-        # self.add_talent_bar(tl.Engineer(0))
-        # self.add_talent_bar(tl.EngineerOperative(0))
-        # self.add_talent_bar(tl.Infiltrator(0))
-        # self.add_talent_bar(tl.InfiltratorCommando(0))
-        # self.add_talent_bar(tl.InfiltratorOperative(0))
-        # self.add_talent_bar(tl.Sentinel(0))
-        # self.add_talent_bar(tl.SentinelBastion(0))
-        # self.add_talent_bar(tl.SentinelMedic(0))
-        # self.add_talent_bar(tl.Soldier(0))
-        # self.add_talent_bar(tl.SoldierCommando(0))
-        # self.add_talent_bar(tl.SoldierShockTrooper(0))
-        # self.add_talent_bar(tl.Decryption(0))
-        # self.add_talent_bar(tl.Electronics(0))
-        # self.add_talent_bar(tl.Hacking(0))
-        # self.add_talent_bar(tl.Damping(0))
-        # self.add_talent_bar(tl.Medicine(0))
-        self.add_talent_bar(tl.Barrier(0))
-        self.add_talent_bar(tl.Lift(0))
-        # self.add_talent_bar(tl.Singularity(0))
-        # self.add_talent_bar(tl.Stasis(0))
-        self.add_talent_bar(tl.Throw(0))
-        self.add_talent_bar(tl.Warp(0))
-        # self.add_talent_bar(tl.Vanguard(0))
-        self.add_talent_bar(tl.VanguardNemesis(0))
-        self.add_talent_bar(tl.SpectreTraining(0))
-        # self.add_talent_bar(tl.VanguardShockTrooper(0))
-    
     def get_talents(self):
-        return [bar.talent for bar in self.findChildren(TalentBar)]
-    
+        return self.model.build()
+
+
+class ComparisonTable(QTableWidget):
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.builds: list[Build] = []
+        self.names: list[str] = []
+        self.setWindowTitle("Comparison")
+        self.resize(640, 480)
+
+    def add_build(self, build: Build, name: str):
+        self.builds.append(build)
+        self.names.append(name)
+        self.refresh()
+
+    def clear_builds(self):
+        self.builds.clear()
+        self.names.clear()
+        self.refresh()
+
+    def refresh(self):
+        # Only needed once a build is compared, so not imported at startup
+        import compare
+        comparison = compare.compare(self.builds, self.names)
+        changed = comparison.changed()
+        highlight = QBrush(QColor(255, 255, 160))
+        self.clear()
+        self.setColumnCount(len(comparison.names))
+        self.setRowCount(len(comparison.rows))
+        self.setHorizontalHeaderLabels(comparison.names)
+        self.setVerticalHeaderLabels([stat_name(stat) for stat in comparison.rows])
+        for row, (stat, values) in enumerate(comparison.rows.items()):
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(str(display_value(stat, value)))
+                if stat in changed:
+                    item.setBackground(highlight)
+                self.setItem(row, column, item)
+
 
 if __name__ == "__main__":
     import sys